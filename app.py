@@ -1,25 +1,38 @@
 """
-Flask web application for document chatbot with integrated STT and TTS.
+Quart web application for document chatbot with integrated STT and TTS.
 """
 
 import os
 import uuid
-import json
+import secrets
+import hashlib
+import shutil
+import mmap
+import asyncio
+import orjson
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, Response, session
-from flask_cors import CORS
+from quart import Quart, render_template, request, jsonify, Response, session
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
 from werkzeug.utils import secure_filename
 import docx
+import zipfile
+from lxml import etree
 import PyPDF2
+import pypdfium2 as pdfium
 from pathlib import Path
-from src.call_summary.main import model
-from src.call_summary.utils.logging import get_logger
+from src.call_summary.main import model, warm_up as warm_up_llm
+from src.call_summary.connections.llm_connector import aclose_clients as aclose_llm_clients
+from src.call_summary.utils.logging import get_logger, setup_logging, setup_worker_logging
 from src.call_summary.utils.settings import config
-import tempfile
+from src.call_summary.utils.session_store import create_session_store
+from src.call_summary.utils.batching import MicroBatcher
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import time
 import io
-import soundfile as sf
 import numpy as np
+import av
 import ssl
 import urllib.request
 
@@ -56,23 +69,34 @@ def configure_ssl():
         print("✓ Using system default SSL settings")
         return None
 
-# Configure SSL before importing ML models
+# Configure SSL before any ML model is downloaded
 ssl_context = configure_ssl()
 
-# Import ML models for voice capabilities
-import mlx_whisper
-from mlx_audio.tts.models.kokoro import KokoroPipeline
-from mlx_audio.tts.utils import load_model
-
+setup_logging()
 logger = get_logger()
 
-app = Flask(__name__)
-CORS(app)
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes jsonify() responses with orjson."""
+
+    def dumps(self, obj, **kwargs):
+        # Numpy arrays (e.g. embedding vectors) serialize natively; anything else
+        # orjson does not know falls back to the default provider's conversions
+        return orjson.dumps(
+            obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app = Quart(__name__)
+app.json = OrjsonProvider(app)
+app = cors(app)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
 
-# Map of Whisper model sizes to their MLX paths
+# Map of Whisper model sizes to their full-precision MLX paths
 WHISPER_MODELS = {
     'tiny': 'mlx-community/whisper-tiny-mlx',
     'base': 'mlx-community/whisper-base-mlx',
@@ -81,30 +105,278 @@ WHISPER_MODELS = {
     'large': 'mlx-community/whisper-large-v3-mlx'
 }
 
-# Default Whisper model - using small for good balance of speed and accuracy
-default_whisper_model = 'small'
-whisper_model_path = WHISPER_MODELS[default_whisper_model]
+# Quantized weight variants published next to each repo. Decoding is memory-bandwidth
+# bound, so fewer weight bytes means faster transcription; int8 is the accuracy-safe default.
+WHISPER_QUANT_VARIANTS = {
+    'q8': '-8bit',
+    'q4': '-4bit',
+    'fp16': ''
+}
+default_whisper_quant = 'q8'
+
+
+def get_whisper_repo(model_size, quant=default_whisper_quant):
+    """Return the MLX repo for a Whisper size at the given weight quantization."""
+    return WHISPER_MODELS[model_size] + WHISPER_QUANT_VARIANTS[quant]
+
+
+# Default Whisper model - int8 base keeps interactive voice latency low with
+# accuracy close to full-precision small
+default_whisper_model = 'base'
+whisper_model_path = get_whisper_repo(default_whisper_model)
+
+# Per-request quality presets for callers that trade latency for accuracy
+WHISPER_QUALITY = {
+    'fast': 'base',
+    'balanced': 'small',
+    'accurate': 'medium'
+}
+
+tts_model_id = 'mlx-community/Kokoro-82M-bf16'
+
+# Kokoro is loaded from full-precision weights and dynamically quantized to int8
+TTS_QUANT_BITS = 8
+TTS_QUANT_GROUP_SIZE = 64
+
+
+def tts_quantized_weights_path(model_id):
+    """Cache file for quantized Kokoro weights; keyed on everything that shapes them."""
+    name = f"{model_id.replace('/', '--')}-int{TTS_QUANT_BITS}-g{TTS_QUANT_GROUP_SIZE}"
+    return os.path.join('models', f'{name}.safetensors')
+
+
+def load_quantized_tts_model(model_id):
+    """Load Kokoro with int8 linear layers, reusing quantized weights saved by a previous run."""
+    import mlx.core as mx
+    import mlx.nn as nn
+    from mlx.utils import tree_flatten
+    from mlx_audio.tts.models.kokoro import Model, ModelConfig
+    from mlx_audio.tts.utils import load_config, load_model
+
+    def is_quantizable(_path, module):
+        # Only linear layers; embeddings and non-divisible projections stay full precision
+        return isinstance(module, nn.Linear) and module.weight.shape[-1] % TTS_QUANT_GROUP_SIZE == 0
+
+    def quantize(tts):
+        nn.quantize(tts, group_size=TTS_QUANT_GROUP_SIZE, bits=TTS_QUANT_BITS, class_predicate=is_quantizable)
+
+    weights_path = tts_quantized_weights_path(model_id)
+    if os.path.exists(weights_path):
+        # Build the architecture from config.json only and give it the quantized
+        # layer layout; its placeholder weights are never evaluated, so the bf16
+        # checkpoint is neither read nor re-quantized
+        tts = Model(ModelConfig.from_dict(load_config(model_id)))
+        quantize(tts)
+        tts.load_weights(weights_path)
+        tts.eval()
+        # Read the memory-mapped weights now rather than on the first request
+        mx.eval(tts.parameters())
+    else:
+        tts = load_model(model_id)
+        quantize(tts)
+        os.makedirs(os.path.dirname(weights_path), exist_ok=True)
+        mx.eval(tts.parameters())
+        mx.save_safetensors(weights_path, dict(tree_flatten(tts.parameters())))
+    return tts
+
+# Voice models are created on first use so startup stays fast when voice is unused
+_tts_pipeline = None
+_tts_lock = threading.Lock()
+_whisper = None
+_whisper_lock = threading.Lock()
+# Loaded Whisper models keyed by repo, so switching sizes never reloads weights
+_whisper_models = {}
+_whisper_models_lock = threading.Lock()
+
+# Speech-to-text timing, updated per /transcribe call and reported by /status
+STT_METRICS = {
+    'requests': 0,
+    'load_time': None,
+    'total_rtf': 0.0,
+    'last': None
+}
+
+
+def get_tts_pipeline():
+    """Return the shared Kokoro pipeline, loading the model on first call."""
+    global _tts_pipeline
+    if _tts_pipeline is None:
+        with _tts_lock:
+            if _tts_pipeline is None:
+                import mlx.core as mx
+                from mlx_audio.tts.models.kokoro import KokoroPipeline
+
+                # MLX already defaults to the Metal GPU when it is available;
+                # the process-wide default is left alone for Whisper's sake
+                app.logger.info(
+                    f"Loading Kokoro 82M model (int{TTS_QUANT_BITS}) on {mx.default_device()}..."
+                )
+                tts_model = load_quantized_tts_model(tts_model_id)
+                _tts_pipeline = KokoroPipeline(lang_code='a', model=tts_model, repo_id=tts_model_id)
+                app.logger.info("Kokoro TTS model ready!")
+    return _tts_pipeline
+
+
+def get_whisper():
+    """Return the mlx_whisper module, importing it on first call."""
+    global _whisper
+    if _whisper is None:
+        with _whisper_lock:
+            if _whisper is None:
+                app.logger.info(f"Loading Whisper (default: {default_whisper_model})...")
+                load_start = time.perf_counter()
+                import mlx_whisper
 
-# Initialize voice models
-app.logger.info("Loading voice models...")
-app.logger.info(f"Loading Whisper models (default: {default_whisper_model})...")
-app.logger.info("Whisper model ready!")
+                _whisper = mlx_whisper
+                STT_METRICS['load_time'] = time.perf_counter() - load_start
+                app.logger.info(f"Whisper ready in {STT_METRICS['load_time']:.2f}s")
+    return _whisper
 
-app.logger.info("Loading Kokoro 82M model...")
-tts_model_id = 'mlx-community/Kokoro-82M-4bit'
-tts_model = load_model(tts_model_id)
-tts_pipeline = KokoroPipeline(lang_code='a', model=tts_model, repo_id=tts_model_id)
-app.logger.info("Kokoro TTS model ready!")
-app.logger.info("All voice models loaded successfully!")
+
+def transcribe_with_cached_model(audio, model_path, **options):
+    """Transcribe with a Whisper model that stays loaded across requests.
+    
+    mlx_whisper.transcribe only takes a repo name and its ModelHolder keeps a
+    single model, so alternating sizes reloaded weights on every switch. Each
+    model is loaded once here and installed into the holder for the call.
+    """
+    whisper = get_whisper()
+    import mlx.core as mx
+    from mlx_whisper.transcribe import ModelHolder
+    
+    with _whisper_models_lock:
+        model = _whisper_models.get(model_path)
+        if model is None:
+            load_start = time.perf_counter()
+            # transcribe() decodes in fp16 by default, so load weights to match
+            model = whisper.load_models.load_model(model_path, dtype=mx.float16)
+            _whisper_models[model_path] = model
+            app.logger.info(f"Loaded Whisper {model_path} in {time.perf_counter() - load_start:.2f}s")
+        
+        ModelHolder.model = model
+        ModelHolder.model_path = model_path
+        return whisper.transcribe(audio, path_or_hf_repo=model_path, **options)
+
+
+# Concurrent transcriptions arriving within a short window share one worker dispatch
+VOICE_BATCH_MAX_SIZE = 8
+VOICE_BATCH_MAX_WAIT_MS = 10
+# Longer recordings bypass the STT batcher so they don't hold up short clips
+STT_BATCH_MAX_SECONDS = 30
+# Transcriptions waiting for the Whisper worker before new requests are held back
+STT_QUEUE_MAXSIZE = 32
+
+
+# Kokoro output format; /generate streams it as 16-bit mono PCM WAV
+TTS_SAMPLE_RATE = 24000
+_tts_inference_lock = threading.Lock()
+
+
+def wav_stream_header(sample_rate, channels=1, bits_per_sample=16):
+    """Build a WAV header for a stream whose length isn't known up front."""
+    block_align = channels * bits_per_sample // 8
+    unknown_size = 0xFFFFFFFF  # Conventional placeholder for streamed RIFF/data chunks
+    return (
+        b'RIFF' + unknown_size.to_bytes(4, 'little') + b'WAVE'
+        + b'fmt ' + (16).to_bytes(4, 'little') + (1).to_bytes(2, 'little')
+        + channels.to_bytes(2, 'little') + sample_rate.to_bytes(4, 'little')
+        + (sample_rate * block_align).to_bytes(4, 'little')
+        + block_align.to_bytes(2, 'little') + bits_per_sample.to_bytes(2, 'little')
+        + b'data' + unknown_size.to_bytes(4, 'little')
+    )
+
+
+# Every /generate response starts with the same 16-bit mono header, so build it once
+TTS_WAV_HEADER = wav_stream_header(TTS_SAMPLE_RATE)
+
+
+def synthesize_pcm16(text, voice, speed):
+    """Yield 16-bit PCM bytes for each Kokoro segment as soon as it is synthesized."""
+    pipeline = get_tts_pipeline()
+    with _tts_inference_lock:
+        # The pipeline yields (graphemes, phonemes, audio) per text segment
+        for _, _, audio_array in pipeline(text, voice=voice, speed=speed):
+            # No copy when the segment is already float32
+            audio_array = np.asarray(audio_array, dtype=np.float32)
+            
+            # If audio is 2D, take the first channel
+            if audio_array.ndim > 1:
+                audio_array = audio_array[0]
+            
+            # Segments are emitted independently, so clip rather than normalize per segment.
+            # Scale into one temporary and clip it in place instead of allocating per step.
+            scaled = np.multiply(audio_array, 32767.0, dtype=np.float32)
+            np.clip(scaled, -32767.0, 32767.0, out=scaled)
+            yield scaled.astype('<i2').tobytes()
+
+
+# Whisper consumes 16 kHz mono float32 audio
+WHISPER_SAMPLE_RATE = 16000
+
+
+def decode_audio(stream, sample_rate):
+    """Decode an uploaded recording to mono float32 at sample_rate without touching disk."""
+    frames = []
+    with av.open(stream) as container:
+        resampler = av.AudioResampler(format='flt', layout='mono', rate=sample_rate)
+        for frame in container.decode(audio=0):
+            frames.extend(out.to_ndarray() for out in resampler.resample(frame))
+        # Flush samples buffered inside the resampler
+        frames.extend(out.to_ndarray() for out in resampler.resample(None))
+    
+    if not frames:
+        return np.zeros(0, dtype=np.float32)
+    # Packed mono frames come back shaped (1, samples)
+    return np.concatenate(frames, axis=1)[0]
+
+
+def transcribe_batch(requests):
+    """Run a batch of (audio, model_path) transcriptions, timing each one."""
+    results = []
+    for audio, model_path in requests:
+        try:
+            inference_start = time.perf_counter()
+            result = transcribe_with_cached_model(audio, model_path, verbose=False)
+            results.append((result, time.perf_counter() - inference_start))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+stt_batcher = MicroBatcher(
+    transcribe_batch,
+    VOICE_BATCH_MAX_SIZE,
+    VOICE_BATCH_MAX_WAIT_MS,
+    max_queue_size=STT_QUEUE_MAXSIZE
+)
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
 
+# Uploads up to this size are extracted from memory and never written to disk
+UPLOAD_IN_MEMORY_MAX_BYTES = 10 * 1024 * 1024
+
+# Uploads are extracted in worker processes, one document per worker
+_extract_executor = None
+
 # Create upload folder if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-# Store documents in session (in production, use a database)
-SESSIONS = {}
+def new_session():
+    """Create the default record for a new chat session."""
+    return {
+        'documents': [],
+        'messages': [],
+        'total_tokens': {'input': 0, 'output': 0},
+        'total_cost': 0.0,
+        'selected_model': 'large',  # Default model
+        'prompt_mode': 'stage1'  # Default prompt mode
+    }
+
+
+# Session records (Redis when REDIS_URL is set); document text is stored separately.
+# Missing sessions are created from new_session() on first access, like a defaultdict.
+SESSIONS = create_session_store(default_factory=new_session)
 
 # Model options from config
 MODEL_OPTIONS = {
@@ -125,31 +397,159 @@ MODEL_OPTIONS = {
     }
 }
 
+# Per-token (input, output) prices, precomputed for the fallback cost calculation
+COST_PER_TOKEN = {
+    size: (options['cost_input'] / 1000, options['cost_output'] / 1000)
+    for size, options in MODEL_OPTIONS.items()
+}
+
+
+def classify_upload(filename):
+    """Sanitize an upload's filename and check its extension in one pass.
+    
+    The extension is taken from the sanitized name, which is the name every
+    later step (extraction, storage) actually sees.
+    
+    Returns:
+        Tuple of (safe filename, lowercase extension, whether it is allowed)
+    """
+    safe_name = secure_filename(filename)
+    dot = safe_name.rfind('.')
+    extension = safe_name[dot + 1:].lower() if dot >= 0 else ''
+    return safe_name, extension, extension in ALLOWED_EXTENSIONS
+
 
-def allowed_file(filename):
-    """Check if file extension is allowed."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+def get_extract_executor():
+    """Return the shared process pool used for document text extraction."""
+    global _extract_executor
+    if _extract_executor is None:
+        # Workers log directly; the parent's queue listener thread does not survive the fork
+        _extract_executor = ProcessPoolExecutor(
+            max_workers=os.cpu_count(), initializer=setup_worker_logging
+        )
+    return _extract_executor
 
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file."""
+def extract_text_from_pdf(source):
+    """Extract text from PDF file (path or in-memory buffer)."""
+    try:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            pages = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                # PDFium reports line breaks as CRLF
+                pages.append(textpage.get_text_range().replace('\r\n', '\n'))
+                # Free native page buffers as we go so large PDFs stay flat in memory
+                textpage.close()
+                page.close()
+            return '\n'.join(pages)
+        finally:
+            pdf.close()
+    except Exception as e:
+        logger.warning(f"PDFium extraction failed, falling back to PyPDF2: {e}")
+        if not isinstance(source, str):
+            source.seek(0)
+        return extract_text_from_pdf_pypdf2(source)
+
+
+def extract_text_from_pdf_pypdf2(source):
+    """Extract text from PDF file with PyPDF2 (slower pure-Python fallback)."""
     text = []
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text.append(page.extract_text())
+        pdf_reader = PyPDF2.PdfReader(source)
+        # Runs inside an extraction worker process already, so pages are read in order here
+        for page in pdf_reader.pages:
+            text.append(page.extract_text())
         return '\n'.join(text)
     except Exception as e:
         logger.error(f"Error extracting PDF text: {e}")
         return f"Error reading PDF: {str(e)}"
 
 
-def extract_text_from_docx(file_path):
-    """Extract text from Word document."""
+# WordprocessingML tags and queries, compiled once; python-docx wraps the same lxml tree
+WORD_NS = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+W_BODY = f"{{{WORD_NS['w']}}}body"
+W_TBL = f"{{{WORD_NS['w']}}}tbl"
+W_P = f"{{{WORD_NS['w']}}}p"
+W_TR = f"{{{WORD_NS['w']}}}tr"
+DOCX_ROW_CELLS = etree.XPath('w:tc', namespaces=WORD_NS)
+DOCX_CELL_PARAGRAPHS = etree.XPath('w:p', namespaces=WORD_NS)
+# Text-bearing children of a paragraph's own runs, in document order. Only
+# direct run children are read, so text boxes and mc:Fallback copies are skipped
+_DOCX_RUN_CONTENT = 'w:r/*[self::w:t or self::w:tab or self::w:ptab or self::w:br or self::w:cr or self::w:noBreakHyphen]'
+DOCX_RUN_CONTENT = etree.XPath(f'{_DOCX_RUN_CONTENT} | w:hyperlink/{_DOCX_RUN_CONTENT}', namespaces=WORD_NS)
+W_T = f"{{{WORD_NS['w']}}}t"
+W_BR_TYPE = f"{{{WORD_NS['w']}}}type"
+# Plain-text equivalents of the non-text run children, as python-docx's Run.text maps them
+DOCX_RUN_SYMBOLS = {
+    f"{{{WORD_NS['w']}}}tab": '\t',
+    f"{{{WORD_NS['w']}}}ptab": '\t',
+    f"{{{WORD_NS['w']}}}cr": '\n',
+    f"{{{WORD_NS['w']}}}noBreakHyphen": '-',
+}
+
+
+def docx_paragraph_text(paragraph):
+    """Return a w:p element's text the way python-docx's Paragraph.text does."""
+    parts = []
+    for child in DOCX_RUN_CONTENT(paragraph):
+        if child.tag == W_T:
+            parts.append(child.text or '')
+        elif child.tag in DOCX_RUN_SYMBOLS:
+            parts.append(DOCX_RUN_SYMBOLS[child.tag])
+        elif child.get(W_BR_TYPE, 'textWrapping') == 'textWrapping':
+            parts.append('\n')  # Page and column breaks carry no text
+    return ''.join(parts)
+
+
+def extract_text_from_docx(source):
+    """Extract text from Word document XML in one streaming pass (path or in-memory buffer)."""
     try:
-        doc = docx.Document(file_path)
+        paragraphs = []
+        table_rows = []
+        with zipfile.ZipFile(source) as archive, archive.open('word/document.xml') as xml:
+            events = etree.iterparse(
+                xml, events=('end',), tag=(W_P, W_TR), resolve_entities=False, huge_tree=True
+            )
+            for _, elem in events:
+                parent = elem.getparent()
+                if elem.tag == W_P:
+                    if parent.tag != W_BODY:
+                        continue  # Cell paragraphs are read with their row
+                    text = docx_paragraph_text(elem)
+                    if text.strip():
+                        paragraphs.append(text)
+                else:
+                    if parent.tag != W_TBL or parent.getparent().tag != W_BODY:
+                        continue  # Nested tables are not part of their cell's text
+                    row_text = []
+                    for cell in DOCX_ROW_CELLS(elem):
+                        cell_text = '\n'.join(docx_paragraph_text(p) for p in DOCX_CELL_PARAGRAPHS(cell)).strip()
+                        if cell_text:
+                            row_text.append(cell_text)
+                    if row_text:
+                        table_rows.append(' | '.join(row_text))
+                
+                # Drop what has been read so the tree never holds more than one block
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del parent[0]
+        
+        # Table rows follow body text, one line per row with cells separated by " | "
+        paragraphs.extend(table_rows)
+        return '\n'.join(paragraphs)
+    except Exception as e:
+        logger.warning(f"DOCX XML extraction failed, falling back to python-docx: {e}")
+        if not isinstance(source, str):
+            source.seek(0)
+        return extract_text_from_docx_python_docx(source)
+
+
+def extract_text_from_docx_python_docx(source):
+    """Extract text from Word document with python-docx (slower object-model fallback)."""
+    try:
+        doc = docx.Document(source)
         paragraphs = []
         for paragraph in doc.paragraphs:
             if paragraph.text.strip():
@@ -171,34 +571,113 @@ def extract_text_from_docx(file_path):
         return f"Error reading Word document: {str(e)}"
 
 
-def extract_text_from_file(file_path, filename):
-    """Extract text based on file type."""
+def normalize_newlines(text):
+    """Translate CRLF and lone CR line endings to LF, as a text-mode read does."""
+    if '\r' not in text:
+        return text
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def extract_text_from_file(source, filename):
+    """Extract text based on file type from a file path or in-memory buffer."""
     extension = filename.rsplit('.', 1)[1].lower()
     
     if extension == 'pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(source)
     elif extension in ['docx', 'doc']:
-        return extract_text_from_docx(file_path)
+        return extract_text_from_docx(source)
     elif extension == 'txt':
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        # Decode straight from the buffer or a file mapping, without an intermediate bytes copy
+        if not isinstance(source, str):
+            return normalize_newlines(str(source.getbuffer(), 'utf-8'))
+        with open(source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ''
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return normalize_newlines(str(mapped, 'utf-8'))
     else:
         return "Unsupported file type"
 
 
-def get_file_metadata(file_path, original_filename):
-    """Extract comprehensive file metadata."""
-    path = Path(file_path)
-    stat = path.stat()
+# Uploads are copied in chunks small enough to stay cache-resident while hashing
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class CountingHashingWriter:
+    """File-like wrapper that hashes and counts bytes on their way to a target."""
+    
+    def __init__(self, target):
+        self.target = target
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+    
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.target.write(data)
+    
+    def hexdigest(self):
+        return self.sha256.hexdigest()
+
+
+def save_upload(stream, file_path):
+    """Write an uploaded file to disk, hashing and sizing it in the same pass.
+    
+    Returns:
+        Tuple of (hex SHA-256 digest, size in bytes)
+    """
+    with open(file_path, 'wb') as f:
+        writer = CountingHashingWriter(f)
+        shutil.copyfileobj(stream, writer, UPLOAD_CHUNK_SIZE)
+    return writer.hexdigest(), writer.size
+
+
+def read_upload(stream):
+    """Read an uploaded file into memory, hashing and sizing it in the same pass.
+    
+    Returns:
+        Tuple of (BytesIO positioned at the start, hex SHA-256 digest, size in bytes)
+    """
+    buffer = io.BytesIO()
+    writer = CountingHashingWriter(buffer)
+    shutil.copyfileobj(stream, writer, UPLOAD_CHUNK_SIZE)
+    buffer.seek(0)
+    return buffer, writer.hexdigest(), writer.size
+
+
+# Bump when extractor output changes so texts cached by older code are not reused
+EXTRACTION_CACHE_VERSION = 3
+
+
+async def extract_text_cached(source, filename, digest):
+    """Extract text in a worker process, reusing earlier results for byte-identical uploads."""
+    digest = f"v{EXTRACTION_CACHE_VERSION}:{digest}"
+    cached = await SESSIONS.aget_extracted_text(digest)
+    if cached is not None:
+        logger.info(f"Extraction cache hit for {filename}")
+        return cached
+    
+    # Parsing is CPU-bound and mostly holds the GIL, so run it outside this process
+    loop = asyncio.get_running_loop()
+    text_content = await loop.run_in_executor(get_extract_executor(), extract_text_from_file, source, filename)
+    # Extractors report failures as text; don't pin those in the cache
+    if not text_content.startswith(('Error ', 'Unsupported file type')):
+        await SESSIONS.aset_extracted_text(digest, text_content)
+    return text_content
+
+
+def get_file_metadata(file_path, original_filename, size_bytes):
+    """Extract comprehensive file metadata (file_path is None for in-memory uploads)."""
+    upload_timestamp = datetime.now().isoformat()
     
     metadata = {
         'original_filename': original_filename,
         'file_extension': original_filename.rsplit('.', 1)[1].lower() if '.' in original_filename else 'unknown',
-        'file_size_bytes': stat.st_size,
-        'file_size_human': format_file_size(stat.st_size),
-        'upload_timestamp': datetime.now().isoformat(),
-        'last_modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-        'file_path': str(path.absolute())
+        'file_size_bytes': size_bytes,
+        'file_size_human': format_file_size(size_bytes),
+        'upload_timestamp': upload_timestamp,
+        'last_modified': upload_timestamp,
+        'file_path': str(Path(file_path).absolute()) if file_path else None
     }
     
     return metadata
@@ -213,25 +692,100 @@ def format_file_size(size_bytes):
     return f"{size_bytes:.2f} TB"
 
 
+def evict_uploads():
+    """Delete the least recently written uploads once the folder exceeds its disk budget."""
+    entries = []
+    total_size = 0
+    with os.scandir(app.config['UPLOAD_FOLDER']) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+    
+    if total_size <= config.session.upload_max_bytes:
+        return
+    
+    for _, size, path in sorted(entries):
+        try:
+            os.remove(path)
+            total_size -= size
+            logger.info(f"Evicted upload {path} to stay within disk budget")
+        except OSError:
+            pass  # File might already be deleted
+        if total_size <= config.session.upload_max_bytes:
+            break
+
+
+# Server-sent event framing, pre-encoded so each chunk is a single bytes concat
+SSE_DATA_PREFIX = b"data: "
+SSE_EVENT_SUFFIX = b"\n\n"
+
+
+def sse_event(payload):
+    """Encode a payload as one server-sent event."""
+    return SSE_DATA_PREFIX + orjson.dumps(payload) + SSE_EVENT_SUFFIX
+
+
+# Chunks buffered ahead of a slow client before the producer thread blocks
+STREAM_QUEUE_MAXSIZE = 32
+
+
+async def iterate_in_thread(iterator, maxsize=STREAM_QUEUE_MAXSIZE):
+    """Drive a blocking iterator from a background thread through a bounded queue.
+    
+    The producer thread runs ahead of the consumer by at most maxsize items, so
+    a slow client applies back-pressure instead of buffering the whole stream.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+    sentinel = object()
+    
+    def produce():
+        item = sentinel
+        try:
+            for item in iterator:
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+                if stopped.is_set():
+                    break
+            item = sentinel
+        except Exception as e:
+            item = e
+        finally:
+            if hasattr(iterator, 'close'):
+                iterator.close()
+        if not stopped.is_set():
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+    
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = await queue.get()
+            if item is sentinel:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Consumer is gone (finished, failed or client disconnected): unblock the producer
+        stopped.set()
+        while not queue.empty():
+            queue.get_nowait()
+
+
 @app.route('/')
-def index():
+async def index():
     """Main chat interface."""
     if 'session_id' not in session:
-        session['session_id'] = str(uuid.uuid4())
-        SESSIONS[session['session_id']] = {
-            'documents': [],
-            'messages': [],
-            'total_tokens': {'input': 0, 'output': 0},
-            'total_cost': 0.0,
-            'selected_model': 'large',  # Default model
-            'prompt_mode': 'stage1'  # Default prompt mode
-        }
+        session['session_id'] = uuid.uuid4().hex
+        await SESSIONS.aset(session['session_id'], new_session())
     
-    return render_template('chat.html')
+    return await render_template('chat.html')
 
 
 @app.route('/upload', methods=['POST'])
-def upload_document():
+async def upload_document():
     """Handle document upload."""
     try:
         if 'session_id' not in session:
@@ -239,58 +793,63 @@ def upload_document():
         
         session_id = session['session_id']
         
-        if session_id not in SESSIONS:
-            SESSIONS[session_id] = {
-                'documents': [],
-                'messages': [],
-                'total_tokens': {'input': 0, 'output': 0},
-                'total_cost': 0.0,
-                'selected_model': 'large',  # Default model
-                'prompt_mode': 'stage1'  # Default prompt mode
-            }
-        
-        if 'file' not in request.files:
+        files = await request.files
+        if 'file' not in files:
             return jsonify({'error': 'No file provided'}), 400
         
-        file = request.files['file']
+        file = files['file']
         
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        if not allowed_file(file.filename):
+        filename, _, allowed = classify_upload(file.filename)
+        if not allowed:
             return jsonify({'error': 'File type not allowed. Please upload PDF or Word documents.'}), 400
         
-        # Save file
-        filename = secure_filename(file.filename)
-        unique_filename = f"{session_id}_{uuid.uuid4().hex[:8]}_{filename}"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(file_path)
+        # Small files are extracted straight from memory; only large ones are saved.
+        # The multipart parser spools the body, so its length is known before copying.
+        file.stream.seek(0, os.SEEK_END)
+        spooled_size = file.stream.tell()
+        file.stream.seek(0)
+        
+        if spooled_size <= UPLOAD_IN_MEMORY_MAX_BYTES:
+            file_path = None
+            source, digest, file_size = await asyncio.to_thread(read_upload, file.stream)
+        else:
+            unique_filename = f"{session_id}_{secrets.token_hex(4)}_{filename}"
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
+            digest, file_size = await asyncio.to_thread(save_upload, file.stream, file_path)
+            source = file_path
         
-        # Extract text
-        text_content = extract_text_from_file(file_path, filename)
+        # Extract text (PDF/DOCX parsing is CPU-bound, keep it off the event loop)
+        text_content = await extract_text_cached(source, filename, digest)
         
         # Get comprehensive file metadata
-        metadata = get_file_metadata(file_path, filename)
+        metadata = get_file_metadata(file_path, filename, file_size)
+        
+        # Calculate token count (approximate)
+        token_count = len(text_content.split())
         
-        # Store document content with unique ID and metadata
-        doc_id = str(uuid.uuid4())[:8]
-        SESSIONS[session_id]['documents'].append({
+        # Store document content under its own key, metadata on the session record
+        # 64 random bits keep IDs unique across many uploads per session
+        doc_id = secrets.token_hex(8)
+        await SESSIONS.aset_document_content(session_id, doc_id, text_content)
+        session_data = await SESSIONS.aget(session_id)
+        session_data['documents'].append({
             'id': doc_id,
             'filename': filename,
-            'content': text_content,
             'path': file_path,
+            'size': file_size,
+            'token_count': token_count,
             'metadata': metadata
         })
+        await SESSIONS.aset(session_id, session_data)
         
-        # Clean up file after extraction (optional)
-        # os.remove(file_path)
+        if file_path:
+            evict_uploads()
         
         logger.info(f"Document uploaded: {filename} for session {session_id}")
         
-        # Calculate token count (approximate)
-        token_count = len(text_content.split())
-        file_size = os.path.getsize(file_path)
-        
         return jsonify({
             'success': True,
             'id': doc_id,
@@ -298,7 +857,7 @@ def upload_document():
             'size': file_size,
             'token_count': token_count,
             'message': f'Successfully uploaded {filename}',
-            'document_count': len(SESSIONS[session_id]['documents'])
+            'document_count': len(session_data['documents'])
         })
         
     except Exception as e:
@@ -307,7 +866,7 @@ def upload_document():
 
 
 @app.route('/remove_document/<doc_id>', methods=['DELETE'])
-def remove_document(doc_id):
+async def remove_document(doc_id):
     """Remove a document from the session."""
     try:
         if 'session_id' not in session:
@@ -315,29 +874,32 @@ def remove_document(doc_id):
         
         session_id = session['session_id']
         
-        if session_id not in SESSIONS:
+        if not await SESSIONS.acontains(session_id):
             return jsonify({'error': 'Session not found'}), 404
         
         # Find and remove the document
-        original_count = len(SESSIONS[session_id]['documents'])
-        SESSIONS[session_id]['documents'] = [
-            doc for doc in SESSIONS[session_id]['documents'] 
-            if doc['id'] != doc_id
-        ]
-        
-        if len(SESSIONS[session_id]['documents']) < original_count:
-            # Also try to delete the file
-            for doc in SESSIONS[session_id]['documents']:
-                if doc['id'] == doc_id and 'path' in doc:
-                    try:
-                        os.remove(doc['path'])
-                    except:
-                        pass  # File might already be deleted
+        session_data = await SESSIONS.aget(session_id)
+        documents = session_data['documents']
+        index = next((i for i, doc in enumerate(documents) if doc['id'] == doc_id), None)
+        
+        if index is not None:
+            removed = documents.pop(index)
+            await SESSIONS.aset(session_id, session_data)
+            await SESSIONS.adelete_document_content(session_id, doc_id)
+            
+            # Also delete the uploaded file, if it was written to disk
+            if removed.get('path'):
+                try:
+                    os.remove(removed['path'])
+                except OSError:
+                    pass  # File might already be deleted or evicted
+            
+            logger.info(f"Document removed: {removed['filename']} from session {session_id}")
             
             return jsonify({
                 'success': True,
                 'message': 'Document removed successfully',
-                'document_count': len(SESSIONS[session_id]['documents'])
+                'document_count': len(session_data['documents'])
             })
         else:
             return jsonify({'error': 'Document not found'}), 404
@@ -348,19 +910,21 @@ def remove_document(doc_id):
 
 
 @app.route('/clear-messages', methods=['POST'])
-def clear_messages():
+async def clear_messages():
     """Clear chat messages and reset token/cost counters from session."""
     try:
         if 'session_id' not in session:
             return jsonify({'error': 'No session found'}), 400
         
         session_id = session['session_id']
-        if session_id in SESSIONS:
+        if await SESSIONS.acontains(session_id):
+            session_data = await SESSIONS.aget(session_id)
             # Clear messages
-            SESSIONS[session_id]['messages'] = []
+            session_data['messages'] = []
             # Reset token counts and costs
-            SESSIONS[session_id]['total_tokens'] = {'input': 0, 'output': 0}
-            SESSIONS[session_id]['total_cost'] = 0.0
+            session_data['total_tokens'] = {'input': 0, 'output': 0}
+            session_data['total_cost'] = 0.0
+            await SESSIONS.aset(session_id, session_data)
             logger.info(f"Cleared messages and reset counters for session {session_id}")
             return jsonify({'success': True, 'message': 'Chat cleared'})
         else:
@@ -371,7 +935,7 @@ def clear_messages():
 
 
 @app.route('/chat', methods=['POST'])
-def chat():
+async def chat():
     """Handle chat messages."""
     try:
         if 'session_id' not in session:
@@ -379,19 +943,11 @@ def chat():
         
         session_id = session['session_id']
         
-        if session_id not in SESSIONS:
-            SESSIONS[session_id] = {
-                'documents': [],
-                'messages': [],
-                'total_tokens': {'input': 0, 'output': 0},
-                'total_cost': 0.0,
-                'selected_model': 'large',  # Default model
-                'prompt_mode': 'stage1'  # Default prompt mode
-            }
+        session_data = await SESSIONS.aget(session_id)
         
-        data = request.json
+        data = await request.get_json()
         message = data.get('message', '')
-        selected_model = data.get('model', SESSIONS[session_id].get('selected_model', 'large'))
+        selected_model = data.get('model', session_data.get('selected_model', 'large'))
         is_voice_mode = data.get('voice_mode', False)
         selected_document_ids = data.get('selected_documents', [])
         use_streaming = data.get('stream', True)  # Default to streaming
@@ -420,53 +976,61 @@ def chat():
             return jsonify({'error': 'No message provided'}), 400
         
         # Update selected model and prompt mode
-        SESSIONS[session_id]['selected_model'] = selected_model
-        SESSIONS[session_id]['prompt_mode'] = prompt_mode
+        session_data['selected_model'] = selected_model
+        session_data['prompt_mode'] = prompt_mode
         
         # Add user message to history
-        SESSIONS[session_id]['messages'].append({
+        session_data['messages'].append({
             'role': 'user',
             'content': message
         })
+        await SESSIONS.aset(session_id, session_data)
         
         # Prepare conversation with documents
         conversation = {
-            'messages': SESSIONS[session_id]['messages'],
+            'messages': session_data['messages'],
             'model': selected_model,
             'prompt_mode': prompt_mode
         }
         
         # Add only SELECTED documents with metadata if available
-        if selected_document_ids and SESSIONS[session_id]['documents']:
+        if selected_document_ids and session_data['documents']:
             # Filter to only include selected documents
             selected_docs = [
-                doc for doc in SESSIONS[session_id]['documents']
+                doc for doc in session_data['documents']
                 if doc['id'] in selected_document_ids
             ]
             if selected_docs:
-                conversation['documents'] = selected_docs
-                logger.info(f"Using {len(selected_docs)} selected documents out of {len(SESSIONS[session_id]['documents'])} total")
+                # Contents are stored apart from the session record; fetch them in one call
+                contents = await SESSIONS.aget_document_contents(session_id, [doc['id'] for doc in selected_docs])
+                conversation['documents'] = [
+                    dict(doc, content=content) for doc, content in zip(selected_docs, contents)
+                ]
+                logger.info(f"Using {len(selected_docs)} selected documents out of {len(session_data['documents'])} total")
         
         # Non-streaming response for o-series models or when streaming is disabled
         if not use_streaming:
             try:
                 # Collect the full response
-                full_response = ""
+                response_parts = []
                 usage_info = None
                 metrics_info = None
                 
-                for chunk in model(conversation):
-                    if chunk.get('type') == 'assistant':
-                        full_response += chunk.get('content', '')
-                    elif chunk.get('type') == 'usage':
+                async for chunk in model(conversation):
+                    chunk_type = chunk.get('type')
+                    if chunk_type == 'assistant':
+                        response_parts.append(chunk.get('content', ''))
+                    elif chunk_type == 'usage':
                         usage_info = chunk.get('usage', {})
                         metrics_info = chunk.get('metrics', {})
-                    elif chunk.get('type') == 'error':
+                    elif chunk_type == 'error':
                         return jsonify({'error': chunk.get('content', 'Unknown error')}), 500
                 
                 # Store the complete response
+                full_response = ''.join(response_parts)
                 if full_response:
-                    SESSIONS[session_id]['messages'].append({
+                    session_data = await SESSIONS.aget(session_id)
+                    session_data['messages'].append({
                         'role': 'assistant',
                         'content': full_response
                     })
@@ -476,16 +1040,16 @@ def chat():
                         input_tokens = usage_info.get('prompt_tokens', 0)
                         output_tokens = usage_info.get('completion_tokens', 0)
                         
-                        SESSIONS[session_id]['total_tokens']['input'] += input_tokens
-                        SESSIONS[session_id]['total_tokens']['output'] += output_tokens
+                        session_data['total_tokens']['input'] += input_tokens
+                        session_data['total_tokens']['output'] += output_tokens
                         
                         if metrics_info and 'total_cost' in metrics_info:
-                            SESSIONS[session_id]['total_cost'] += metrics_info['total_cost']
+                            session_data['total_cost'] += metrics_info['total_cost']
                         else:
-                            model_config = MODEL_OPTIONS[selected_model]
-                            input_cost = (input_tokens / 1000) * model_config['cost_input']
-                            output_cost = (output_tokens / 1000) * model_config['cost_output']
-                            SESSIONS[session_id]['total_cost'] += input_cost + output_cost
+                            input_price, output_price = COST_PER_TOKEN[selected_model]
+                            session_data['total_cost'] += input_tokens * input_price + output_tokens * output_price
+                    
+                    await SESSIONS.aset(session_id, session_data)
                 
                 return jsonify({
                     'content': full_response,
@@ -497,41 +1061,40 @@ def chat():
                 return jsonify({'error': str(e)}), 500
         
         # Stream response (existing streaming code)
-        def generate():
-            assistant_message = ""
+        async def generate():
+            # Joined once at the end; repeated += re-copies long replies
+            message_parts = []
             usage_info = None
             metrics_info = None
             chunk_count = 0
             last_content = ""
             
             try:
-                for chunk in model(conversation):
+                async for chunk in model(conversation):
                     chunk_count += 1
+                    chunk_type = chunk.get('type')
                     
-                    if chunk.get('type') == 'assistant':
+                    if chunk_type == 'assistant':
                         content = chunk.get('content', '')
                         last_content = content
-                        assistant_message += content
-                        
-                        # Remove verbose chunk logging - only track for error reporting
+                        message_parts.append(content)
                         
                         # Send as JSON for the frontend to parse
                         try:
-                            # Use ensure_ascii=False to handle special characters properly
-                            json_data = json.dumps({'content': content}, ensure_ascii=False)
-                            yield f"data: {json_data}\n\n"
-                        except Exception as json_error:
+                            # orjson emits UTF-8 bytes directly, no ensure_ascii escaping
+                            yield sse_event({'content': content})
+                        except orjson.JSONEncodeError as json_error:
                             logger.error(f"JSON encoding error at chunk {chunk_count}: {str(json_error)}, content={repr(content)}")
-                            # Try to send with escaped content
+                            # Try to send with escaped content (e.g. lone surrogates)
                             escaped_content = content.encode('unicode_escape').decode('ascii')
-                            yield f"data: {json.dumps({'content': escaped_content})}\n\n"
+                            yield sse_event({'content': escaped_content})
                             
-                    elif chunk.get('type') == 'error':
+                    elif chunk_type == 'error':
                         error_msg = chunk.get('content', 'Unknown error')
                         logger.error(f"Error during streaming at chunk {chunk_count}: {error_msg}")
-                        yield f"data: {json.dumps({'error': error_msg}, ensure_ascii=False)}\n\n"
+                        yield sse_event({'error': error_msg})
                         
-                    elif chunk.get('type') == 'usage':
+                    elif chunk_type == 'usage':
                         # Capture usage information from the LLM response
                         usage_info = chunk.get('usage', {})
                         metrics_info = chunk.get('metrics', {})
@@ -539,12 +1102,15 @@ def chat():
             except Exception as e:
                 logger.error(f"Exception in generate function at chunk {chunk_count}: {str(e)}", exc_info=True)
                 logger.error(f"Last content before error: {repr(last_content)}")
-                logger.error(f"Total message so far ({len(assistant_message)} chars): {repr(assistant_message[:500])}")
-                yield f"data: {json.dumps({'error': f'Streaming error at chunk {chunk_count}: {str(e)}'}, ensure_ascii=False)}\n\n"
+                partial_message = ''.join(message_parts)
+                logger.error(f"Total message so far ({len(partial_message)} chars): {repr(partial_message[:500])}")
+                yield sse_event({'error': f'Streaming error at chunk {chunk_count}: {str(e)}'})
             
             # Store assistant message and track tokens/cost from actual API response
+            assistant_message = ''.join(message_parts)
             if assistant_message:
-                SESSIONS[session_id]['messages'].append({
+                session_data = await SESSIONS.aget(session_id)
+                session_data['messages'].append({
                     'role': 'assistant',
                     'content': assistant_message
                 })
@@ -554,18 +1120,18 @@ def chat():
                     input_tokens = usage_info.get('prompt_tokens', 0)
                     output_tokens = usage_info.get('completion_tokens', 0)
                     
-                    SESSIONS[session_id]['total_tokens']['input'] += input_tokens
-                    SESSIONS[session_id]['total_tokens']['output'] += output_tokens
+                    session_data['total_tokens']['input'] += input_tokens
+                    session_data['total_tokens']['output'] += output_tokens
                     
                     # Use the pre-calculated cost from llm_connector if available
                     if metrics_info and 'total_cost' in metrics_info:
-                        SESSIONS[session_id]['total_cost'] += metrics_info['total_cost']
+                        session_data['total_cost'] += metrics_info['total_cost']
                     else:
                         # Fallback to manual calculation if metrics not available
-                        model_config = MODEL_OPTIONS[selected_model]
-                        input_cost = (input_tokens / 1000) * model_config['cost_input']
-                        output_cost = (output_tokens / 1000) * model_config['cost_output']
-                        SESSIONS[session_id]['total_cost'] += input_cost + output_cost
+                        input_price, output_price = COST_PER_TOKEN[selected_model]
+                        session_data['total_cost'] += input_tokens * input_price + output_tokens * output_price
+                
+                await SESSIONS.aset(session_id, session_data)
         
         return Response(generate(), mimetype='text/event-stream')
         
@@ -575,26 +1141,21 @@ def chat():
 
 
 @app.route('/clear', methods=['POST'])
-def clear_session():
+async def clear_session():
     """Clear session documents and messages."""
     try:
         if 'session_id' in session:
             session_id = session['session_id']
             
             # Clean up uploaded files
-            if session_id in SESSIONS:
-                for doc in SESSIONS[session_id].get('documents', []):
-                    if 'path' in doc and os.path.exists(doc['path']):
+            if await SESSIONS.acontains(session_id):
+                for doc in (await SESSIONS.aget(session_id)).get('documents', []):
+                    if doc.get('path') and os.path.exists(doc['path']):
                         os.remove(doc['path'])
                 
-                # Clear session data
-                SESSIONS[session_id] = {
-                    'documents': [],
-                    'messages': [],
-                    'total_tokens': {'input': 0, 'output': 0},
-                    'total_cost': 0.0,
-                    'selected_model': 'large'  # Default model
-                }
+                # Clear session data (drops stored document contents too)
+                await SESSIONS.adelete(session_id)
+                await SESSIONS.aset(session_id, new_session())
             
             logger.info(f"Session cleared: {session_id}")
         
@@ -605,57 +1166,8 @@ def clear_session():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/remove_document_old', methods=['POST'])
-def remove_document_old():
-    """Remove a specific document from the session (old endpoint)."""
-    try:
-        if 'session_id' not in session:
-            return jsonify({'error': 'No session found'}), 400
-        
-        session_id = session['session_id']
-        
-        if session_id not in SESSIONS:
-            return jsonify({'error': 'Session not found'}), 400
-        
-        data = request.json
-        doc_id = data.get('document_id')
-        
-        if not doc_id:
-            return jsonify({'error': 'No document_id provided'}), 400
-        
-        # Find and remove the document
-        documents = SESSIONS[session_id]['documents']
-        doc_to_remove = None
-        for doc in documents:
-            if doc['id'] == doc_id:
-                doc_to_remove = doc
-                break
-        
-        if doc_to_remove:
-            # Remove file if it exists
-            if 'path' in doc_to_remove and os.path.exists(doc_to_remove['path']):
-                os.remove(doc_to_remove['path'])
-            
-            # Remove from session
-            documents.remove(doc_to_remove)
-            
-            logger.info(f"Document removed: {doc_to_remove['filename']} from session {session_id}")
-            
-            return jsonify({
-                'success': True,
-                'message': f"Removed {doc_to_remove['filename']}",
-                'documents': [{'id': d['id'], 'filename': d['filename']} for d in documents]
-            })
-        else:
-            return jsonify({'error': 'Document not found'}), 404
-            
-    except Exception as e:
-        logger.error(f"Remove document error: {e}")
-        return jsonify({'error': str(e)}), 500
-
-
 @app.route('/set_model', methods=['POST'])
-def set_model():
+async def set_model():
     """Set the model for the session."""
     try:
         if 'session_id' not in session:
@@ -663,23 +1175,15 @@ def set_model():
         
         session_id = session['session_id']
         
-        if session_id not in SESSIONS:
-            SESSIONS[session_id] = {
-                'documents': [],
-                'messages': [],
-                'total_tokens': {'input': 0, 'output': 0},
-                'total_cost': 0.0,
-                'selected_model': 'large',  # Default model
-                'prompt_mode': 'stage1'  # Default prompt mode
-            }
-        
-        data = request.json
+        data = await request.get_json()
         model_size = data.get('model')
         
         if model_size not in MODEL_OPTIONS:
             return jsonify({'error': 'Invalid model size'}), 400
         
-        SESSIONS[session_id]['selected_model'] = model_size
+        session_data = await SESSIONS.aget(session_id)
+        session_data['selected_model'] = model_size
+        await SESSIONS.aset(session_id, session_data)
         
         return jsonify({
             'success': True,
@@ -693,7 +1197,7 @@ def set_model():
 
 
 @app.route('/set_prompt', methods=['POST'])
-def set_prompt():
+async def set_prompt():
     """Set the prompt mode for the session."""
     try:
         if 'session_id' not in session:
@@ -701,24 +1205,16 @@ def set_prompt():
         
         session_id = session['session_id']
         
-        if session_id not in SESSIONS:
-            SESSIONS[session_id] = {
-                'documents': [],
-                'messages': [],
-                'total_tokens': {'input': 0, 'output': 0},
-                'total_cost': 0.0,
-                'selected_model': 'large',  # Default model
-                'prompt_mode': 'stage1'  # Default prompt mode
-            }
-        
-        data = request.json
+        data = await request.get_json()
         prompt_mode = data.get('prompt_mode')
         
         valid_modes = ['stage1', 'stage2', 'basic', 'default']
         if prompt_mode not in valid_modes:
             return jsonify({'error': 'Invalid prompt mode'}), 400
         
-        SESSIONS[session_id]['prompt_mode'] = prompt_mode
+        session_data = await SESSIONS.aget(session_id)
+        session_data['prompt_mode'] = prompt_mode
+        await SESSIONS.aset(session_id, session_data)
         
         return jsonify({
             'success': True,
@@ -731,13 +1227,13 @@ def set_prompt():
 
 
 @app.route('/models', methods=['GET'])
-def get_models():
+async def get_models():
     """Get available models."""
     return jsonify(MODEL_OPTIONS)
 
 
 @app.route('/status', methods=['GET'])
-def status():
+async def status():
     """Get current session status."""
     try:
         if 'session_id' not in session:
@@ -749,32 +1245,30 @@ def status():
         
         session_id = session['session_id']
         
-        if session_id not in SESSIONS:
-            SESSIONS[session_id] = {
-                'documents': [],
-                'messages': [],
-                'total_tokens': {'input': 0, 'output': 0},
-                'total_cost': 0.0,
-                'selected_model': 'large',  # Default model
-                'prompt_mode': 'stage1'  # Default prompt mode
-            }
+        session_data = await SESSIONS.aget(session_id)
         
         return jsonify({
             'session_id': session_id,
-            'document_count': len(SESSIONS[session_id]['documents']),
-            'message_count': len(SESSIONS[session_id]['messages']),
+            'document_count': len(session_data['documents']),
+            'message_count': len(session_data['messages']),
             'documents': [
                 {
                     'id': doc['id'],
                     'filename': doc['filename'],
-                    'size': os.path.getsize(doc['path']) if os.path.exists(doc['path']) else 0,
-                    'token_count': len(doc.get('content', '').split())
+                    'size': doc.get('size', 0),
+                    'token_count': doc.get('token_count', 0)
                 }
-                for doc in SESSIONS[session_id]['documents']
+                for doc in session_data['documents']
             ],
-            'selected_model': SESSIONS[session_id].get('selected_model', 'large'),
-            'total_tokens': SESSIONS[session_id].get('total_tokens', {'input': 0, 'output': 0}),
-            'total_cost': round(SESSIONS[session_id].get('total_cost', 0.0), 4)
+            'selected_model': session_data.get('selected_model', 'large'),
+            'total_tokens': session_data.get('total_tokens', {'input': 0, 'output': 0}),
+            'total_cost': round(session_data.get('total_cost', 0.0), 4),
+            'stt_metrics': {
+                'requests': STT_METRICS['requests'],
+                'load_time': STT_METRICS['load_time'],
+                'avg_rtf': round(STT_METRICS['total_rtf'] / STT_METRICS['requests'], 3) if STT_METRICS['requests'] else None,
+                'last': STT_METRICS['last']
+            }
         })
         
     except Exception as e:
@@ -787,19 +1281,27 @@ def status():
 # ====================
 
 @app.route('/transcribe', methods=['POST'])
-def transcribe_audio():
+async def transcribe_audio():
     """Transcribe audio using Whisper STT."""
     try:
         # Check if audio file is in the request
-        if 'audio' not in request.files:
+        files = await request.files
+        if 'audio' not in files:
             return jsonify({"error": "No audio file provided"}), 400
         
-        audio_file = request.files['audio']
+        audio_file = files['audio']
         
         # Get the model parameter from form data
-        model_size = request.form.get('model', default_whisper_model)
+        form = await request.form
+        model_size = form.get('model', default_whisper_model)
+        quality = form.get('quality')
+        if quality in WHISPER_QUALITY:
+            model_size = WHISPER_QUALITY[quality]
         if model_size not in WHISPER_MODELS:
             model_size = default_whisper_model
+        quant = form.get('quant', default_whisper_quant)
+        if quant not in WHISPER_QUANT_VARIANTS:
+            quant = default_whisper_quant
         
         # Medium model is now downloaded and available
         # Large model may still need downloading
@@ -807,7 +1309,7 @@ def transcribe_audio():
             app.logger.info(f"Model {model_size} may need downloading, falling back to {default_whisper_model}")
             model_size = default_whisper_model
         
-        selected_model_path = WHISPER_MODELS[model_size]
+        selected_model_path = get_whisper_repo(model_size, quant)
         # Using Whisper model: {model_size}
         
         # Check if file is empty
@@ -821,47 +1323,61 @@ def transcribe_audio():
         
         app.logger.debug(f"Received audio file, size: {file_size} bytes")
         
-        # Save the uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tmp_file:
-            audio_file.save(tmp_file.name)
-            temp_path = tmp_file.name
+        if file_size < 100:  # Too small to be valid audio
+            app.logger.warning("Audio file too small to process")
+            return jsonify({"error": "Audio file too small"}), 400
         
-        try:
-            app.logger.debug(f"Transcribing audio file: {temp_path}")
-            start_time = time.time()
-            
-            # Check file size on disk
-            disk_size = os.path.getsize(temp_path)
-            app.logger.debug(f"Saved file size: {disk_size} bytes")
-            
-            if disk_size < 100:  # Too small to be valid audio
-                app.logger.warning("Audio file too small to process")
-                return jsonify({"error": "Audio file too small"}), 400
-            
-            # Transcribe the audio with selected model
-            result = mlx_whisper.transcribe(
-                temp_path,
-                path_or_hf_repo=selected_model_path,
+        start_time = time.time()
+        
+        # Decode in-process once up front so audio duration (for RTF) and decode cost are known
+        decode_start = time.perf_counter()
+        audio = await asyncio.to_thread(decode_audio, audio_file.stream, WHISPER_SAMPLE_RATE)
+        decode_time = time.perf_counter() - decode_start
+        audio_duration = len(audio) / WHISPER_SAMPLE_RATE
+        
+        # Transcribe the audio with selected model
+        if audio_duration <= STT_BATCH_MAX_SECONDS:
+            result, inference_time = await stt_batcher.submit((audio, selected_model_path))
+        else:
+            inference_start = time.perf_counter()
+            result = await asyncio.to_thread(
+                transcribe_with_cached_model,
+                audio,
+                selected_model_path,
                 verbose=False
             )
-            
-            transcription = result["text"].strip()
-            
-            transcription_time = time.time() - start_time
-            app.logger.info(f"Transcription complete in {transcription_time:.2f}s")
-            
-            if not transcription:
-                return jsonify({"error": "No speech detected"}), 400
-            
-            return jsonify({
-                "text": transcription,
-                "time": transcription_time
-            })
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
+            inference_time = time.perf_counter() - inference_start
+        
+        transcription = result["text"].strip()
+        
+        transcription_time = time.time() - start_time
+        stt_metrics = {
+            'model': model_size,
+            'quant': quant,
+            'audio_duration': round(audio_duration, 3),
+            'decode_time': round(decode_time, 3),
+            'inference_time': round(inference_time, 3),
+            'total_time': round(transcription_time, 3),
+            'rtf': round(transcription_time / audio_duration, 3) if audio_duration else None,
+            # One decoder step per generated token
+            'inference_steps': sum(len(seg.get('tokens', [])) for seg in result.get('segments', []))
+        }
+        STT_METRICS['requests'] += 1
+        STT_METRICS['total_rtf'] += stt_metrics['rtf'] or 0.0
+        STT_METRICS['last'] = stt_metrics
+        app.logger.info(
+            f"Transcription complete in {transcription_time:.2f}s "
+            f"(audio {audio_duration:.2f}s, RTF {stt_metrics['rtf']}, steps {stt_metrics['inference_steps']})"
+        )
+        
+        if not transcription:
+            return jsonify({"error": "No speech detected"}), 400
+        
+        return jsonify({
+            "text": transcription,
+            "time": transcription_time,
+            "metrics": stt_metrics
+        })
         
     except Exception as e:
         app.logger.error(f"Error transcribing audio: {str(e)}")
@@ -871,10 +1387,10 @@ def transcribe_audio():
 
 
 @app.route('/generate', methods=['POST'])
-def generate_audio():
+async def generate_audio():
     """Generate audio using Kokoro TTS."""
     try:
-        data = request.json
+        data = await request.get_json()
         text = data.get('text', '')
         # Accept voice and speed parameters from client
         voice = data.get('voice', 'af_aoede')
@@ -886,44 +1402,27 @@ def generate_audio():
         app.logger.debug(f"Generating TTS audio (voice: {voice}, speed: {speed})")
         start_time = time.time()
         
-        # Generate audio using Kokoro with specified voice
-        # The pipeline returns a generator of (graphemes, phonemes, audio)
-        result = list(tts_pipeline(text, voice=voice, speed=speed))
-        if result:
-            _, _, audio_array = result[0]
-        else:
+        # Synthesize segment by segment; wait only for the first before responding
+        chunks = iterate_in_thread(synthesize_pcm16(text, voice, speed))
+        try:
+            first_chunk = await anext(chunks)
+        except StopAsyncIteration:
             raise ValueError("No audio generated")
+        first_audio_time = time.time() - start_time
         
-        # Convert to numpy array if needed
-        if hasattr(audio_array, 'numpy'):
-            audio_array = audio_array.numpy()
-        
-        # Ensure audio is in the right format (float32, -1 to 1 range)
-        audio_array = np.array(audio_array, dtype=np.float32)
-        
-        # If audio is 2D, take the first channel
-        if len(audio_array.shape) > 1:
-            audio_array = audio_array[0]
-        
-        # Normalize if needed
-        max_val = np.max(np.abs(audio_array))
-        if max_val > 1.0:
-            audio_array = audio_array / max_val
-        
-        generation_time = time.time() - start_time
-        app.logger.debug(f"Audio generated in {generation_time:.2f} seconds")
-        
-        # Convert to WAV bytes
-        buffer = io.BytesIO()
-        sf.write(buffer, audio_array, samplerate=24000, format='WAV')
-        buffer.seek(0)
+        async def stream_wav():
+            yield TTS_WAV_HEADER
+            yield first_chunk
+            async for chunk in chunks:
+                yield chunk
+            app.logger.debug(f"Audio generated in {time.time() - start_time:.2f} seconds")
         
         return Response(
-            buffer.getvalue(),
+            stream_wav(),
             mimetype='audio/wav',
             headers={
                 'Content-Disposition': 'inline; filename="output.wav"',
-                'X-Generation-Time': str(generation_time)
+                'X-First-Audio-Time': str(first_audio_time)
             }
         )
         
@@ -932,6 +1431,68 @@ def generate_audio():
         return jsonify({"error": str(e)}), 500
 
 
+@app.before_serving
+async def start_llm_warmup():
+    """Open LLM connections in the background so startup is not delayed."""
+    app.add_background_task(warm_up_llm)
+
+
+@app.after_serving
+async def close_llm_clients():
+    """Close the async LLM connection pools while their event loop is still running."""
+    await aclose_llm_clients()
+
+
+def warm_up_whisper():
+    """Load the default Whisper model and compile its decode path on silence."""
+    # Half a second of silence is enough to compile the Whisper decode path
+    transcribe_with_cached_model(
+        np.zeros(WHISPER_SAMPLE_RATE // 2, dtype=np.float32),
+        whisper_model_path,
+        verbose=False
+    )
+
+
+def warm_up_whisper_in_background():
+    """Thread target for startup warm-up; failures only cost the first request."""
+    try:
+        start_time = time.perf_counter()
+        warm_up_whisper()
+        app.logger.info(f"Whisper warmed up in {time.perf_counter() - start_time:.2f}s")
+    except Exception as e:
+        app.logger.warning(f"Whisper warm-up failed: {str(e)}")
+
+
+@app.before_serving
+async def start_whisper_warmup():
+    """Load Whisper in the background when WHISPER_WARMUP is set, so the first /transcribe skips the model load."""
+    # Off by default: text-only deployments should not pay for the voice model
+    if config.whisper_warmup:
+        threading.Thread(target=warm_up_whisper_in_background, daemon=True).start()
+
+
+@app.route('/warmup', methods=['POST'])
+async def warmup():
+    """Load voice models and run one tiny inference each to amortize JIT compilation."""
+    try:
+        start_time = time.time()
+
+        def run_warmup():
+            warm_up_whisper()
+            for _ in synthesize_pcm16("Hi.", 'af_aoede', 1.0):
+                pass
+
+        await asyncio.to_thread(run_warmup)
+
+        warmup_time = time.time() - start_time
+        app.logger.info(f"Voice models warmed up in {warmup_time:.2f}s")
+        return jsonify({'success': True, 'time': warmup_time})
+
+    except Exception as e:
+        app.logger.error(f"Error warming up voice models: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
 if __name__ == '__main__':
     print("\n" + "="*50)
     print("✅ Unified Chat+ Voice Server Starting")
@@ -941,4 +1502,20 @@ if __name__ == '__main__':
     print("   Voice chat:   http://localhost:5003?voice=true")
     print("\n✨ All voice capabilities integrated into single server!")
     print("="*50 + "\n")
-    app.run(debug=True, port=5003)
\ No newline at end of file
+
+    # Serve through hypercorn directly rather than app.run(debug=True), whose
+    # reloader and debug mode are meant for development
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config as HypercornConfig
+
+    hypercorn_config = HypercornConfig()
+    hypercorn_config.bind = ["localhost:5003"]
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None  # Optional; not available on Windows
+
+    if uvloop is not None:
+        uvloop.run(serve(app, hypercorn_config))
+    else:
+        asyncio.run(serve(app, hypercorn_config))
\ No newline at end of file
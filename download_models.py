@@ -53,9 +53,9 @@ def download_models():
         
         print("📥 Downloading Whisper models...")
         whisper_models = {
-            'small': 'mlx-community/whisper-small-mlx',
-            'medium': 'mlx-community/whisper-medium-mlx',
-            'base': 'mlx-community/whisper-base-mlx'
+            'small': 'mlx-community/whisper-small-mlx-8bit',
+            'medium': 'mlx-community/whisper-medium-mlx-8bit',
+            'base': 'mlx-community/whisper-base-mlx-8bit'
         }
         
         for name, repo in whisper_models.items():
@@ -68,7 +68,7 @@ def download_models():
                 print(f"    ⚠ Failed to download {name}: {e}")
         
         print("\n📥 Downloading TTS model...")
-        tts_model_id = 'mlx-community/Kokoro-82M-4bit'
+        tts_model_id = 'mlx-community/Kokoro-82M-bf16'
         print(f"  • Downloading Kokoro from {tts_model_id}...")
         try:
             load_model(tts_model_id)
@@ -7,12 +7,21 @@ from .oauth_connector import setup_authentication, get_oauth_token
 
 # LLM exports
 from .llm_connector import (
+    RuntimeContext,
     complete,
+    acomplete,
     stream,
+    astream,
+    stream_raw,
     complete_with_tools,
     embed,
+    embed_coalesced,
     embed_batch,
+    aembed_batch,
     check_connection,
+    warm_llm_clients,
+    awarm_llm_clients,
+    aclose_clients,
 )
 
 __all__ = [
@@ -20,10 +29,19 @@ __all__ = [
     "setup_authentication",
     "get_oauth_token",
     # LLM
+    "RuntimeContext",
     "complete",
+    "acomplete",
     "stream",
+    "astream",
+    "stream_raw",
     "complete_with_tools",
     "embed",
+    "embed_coalesced",
     "embed_batch",
+    "aembed_batch",
     "check_connection",
+    "warm_llm_clients",
+    "awarm_llm_clients",
+    "aclose_clients",
 ]
\ No newline at end of file
@@ -5,16 +5,139 @@ This module handles all interactions with OpenAI's API, supporting both
 OAuth and API key authentication, with configurable model tiers.
 """
 
-from typing import Any, Dict, Generator, List, Optional
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Dict, Generator, List, NamedTuple, Optional, Tuple, Union
+import asyncio
+import atexit
+import base64
+import functools
+import logging
+import ssl
+import threading
 import time
 import httpx
-from openai import OpenAI
+import numpy as np
+import orjson
+from openai import AsyncOpenAI, OpenAI
 
+from ..utils.batching import MicroBatcher
 from ..utils.logging import get_logger
 from ..utils.settings import config
 
-# Module-level client cache to reuse connections
-_client_cache: Dict[str, OpenAI] = {}
+# Module-level client caches to reuse connections, keyed by _http_client_key().
+# Each entry holds the client for the current auth token; a rotated token
+# replaces it rather than adding an entry.
+_client_cache: Dict[Tuple, OpenAI] = {}
+_async_client_cache: Dict[Tuple, AsyncOpenAI] = {}
+_client_cache_lock = threading.Lock()
+# HTTP connection pools keyed by _http_client_key(), shared by every token's client
+_http_clients: Dict[Tuple, httpx.Client] = {}
+_async_http_clients: Dict[Tuple, httpx.AsyncClient] = {}
+
+# embed_coalesced() batchers, one per (model, dimensions) bucket
+_embedding_batchers: Dict[Tuple, MicroBatcher] = {}
+EMBED_COALESCE_MAX_BATCH = 512
+EMBED_COALESCE_WAIT_MS = 5
+
+# Connection pool sizing shared by the sync and async HTTP clients
+HTTP_POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
+# Per-tier settings resolved once; config is loaded a single time at import
+_TIER_CONFIGS = {
+    "small": config.llm.small,
+    "medium": config.llm.medium,
+    "large": config.llm.large,
+}
+_TIMEOUTS = {
+    **{tier: tier_config.timeout for tier, tier_config in _TIER_CONFIGS.items()},
+    "embedding": config.llm.embedding.timeout,
+}
+# llm_params keys resolved by _get_model_config rather than passed through
+_RESERVED_LLM_KEYS = frozenset({"model", "temperature", "max_tokens"})
+# _get_model_config lookup tables: tier -> (model, temperature, max_tokens)
+# and model name -> (temperature, max_tokens, tier)
+_TIER_DEFAULTS = {
+    tier: (tier_config.model, tier_config.temperature, tier_config.max_tokens)
+    for tier, tier_config in _TIER_CONFIGS.items()
+}
+# Built lowest priority first so that when tiers share a model name the
+# earlier tier wins (small, then large, then medium)
+_MODEL_DEFAULTS = {
+    _TIER_CONFIGS[tier].model: (
+        _TIER_CONFIGS[tier].temperature,
+        _TIER_CONFIGS[tier].max_tokens,
+        tier,
+    )
+    for tier in ("medium", "large", "small")
+}
+# Unknown models use medium defaults
+_UNKNOWN_MODEL_DEFAULTS = (config.llm.medium.temperature, config.llm.medium.max_tokens, "medium")
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeContext:
+    """
+    Per-workflow settings the LLM calls need, resolved once at workflow start.
+
+    The public functions also accept the legacy context dict
+    ({"execution_id", "auth_config", "ssl_config"}) and convert it on entry.
+    """
+
+    execution_id: str
+    auth_token: Optional[str]
+    auth_method: Optional[str]
+    ssl_verify: bool
+    ssl_cert_path: Optional[str]
+
+    @classmethod
+    def from_workflow(
+        cls, execution_id: str, auth_config: Dict[str, Any], ssl_config: Dict[str, Any]
+    ) -> "RuntimeContext":
+        """
+        Build a context from setup_authentication() and setup_ssl() results.
+
+        Args:
+            execution_id: Unique identifier for this execution
+            auth_config: Authentication configuration from workflow
+            ssl_config: SSL configuration from workflow
+
+        Returns:
+            Frozen RuntimeContext
+        """
+        ssl_verify = bool(ssl_config.get("verify"))
+        return cls(
+            execution_id=execution_id,
+            auth_token=auth_config.get("token", "no-token"),
+            auth_method=auth_config.get("method"),
+            ssl_verify=ssl_verify,
+            ssl_cert_path=(ssl_config.get("cert_path") or None) if ssl_verify else None,
+        )
+
+
+def _runtime_context(context: Union[RuntimeContext, Dict[str, Any]]) -> RuntimeContext:
+    """Accept a RuntimeContext or a legacy context dict and return a RuntimeContext."""
+    if isinstance(context, RuntimeContext):
+        return context
+    return RuntimeContext.from_workflow(
+        context["execution_id"], context["auth_config"], context["ssl_config"]
+    )
+
+
+class CostMetrics(NamedTuple):
+    """Cost and usage figures for a single API call."""
+
+    prompt_tokens: int
+    completion_tokens: Optional[int]
+    total_tokens: int
+    prompt_cost: float
+    completion_cost: Optional[float]
+    total_cost: float
+    response_time: float
+    model: str
 
 
 # Cost tracking utilities integrated directly
@@ -24,7 +147,7 @@ def _calculate_cost(
     cost_per_1k_output: Optional[float] = None,
     response_time: float = 0.0,
     model: str = "",
-) -> Dict:
+) -> CostMetrics:
     """
     Calculate cost metrics from token usage.
 
@@ -36,7 +159,7 @@ def _calculate_cost(
         model: Model name used for the operation
 
     Returns:
-        Dictionary with calculated costs and metrics
+        CostMetrics with unrounded costs (USD) and response time (seconds)
     """
     prompt_tokens = usage.get("prompt_tokens", 0)
     completion_tokens = usage.get("completion_tokens")
@@ -54,55 +177,32 @@ def _calculate_cost(
         # For embeddings, only prompt cost
         total_cost = prompt_cost
 
-    return {
-        "prompt_tokens": prompt_tokens,
-        "completion_tokens": completion_tokens,
-        "total_tokens": total_tokens,
-        "prompt_cost": round(prompt_cost, 6),
-        "completion_cost": round(completion_cost, 6) if completion_cost else None,
-        "total_cost": round(total_cost, 6),
-        "response_time": round(response_time, 3),
-        "model": model,
-    }
+    return CostMetrics(
+        prompt_tokens,
+        completion_tokens,
+        total_tokens,
+        prompt_cost,
+        completion_cost,
+        total_cost,
+        response_time,
+        model,
+    )
 
 
-def _format_cost_for_logging(metrics: Dict) -> Dict:
+def _info_enabled(logger) -> bool:
     """
-    Format metrics for structured logging output.
+    Check whether INFO messages would be emitted.
+
+    Hot paths test this before building log payloads, so keyword arguments
+    and f-strings are not assembled only to be dropped by the level filter.
 
     Args:
-        metrics: Dictionary of metrics to format
+        logger: structlog logger from get_logger()
 
     Returns:
-        Dictionary formatted for logging
+        True if the logger's level lets INFO through
     """
-    # Simplified format - single line instead of nested dicts
-    log_data = {
-        "cost": f"${metrics['total_cost']:.6f}",
-    }
-
-    return log_data
-
-
-class ResponseTimer:
-    """
-    Context manager for timing API responses.
-    """
-
-    def __init__(self):
-        """Initialize the timer."""
-        self.start_time = None
-        self.elapsed = 0.0
-
-    def __enter__(self):
-        """Start the timer."""
-        self.start_time = time.time()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Stop the timer and calculate elapsed time."""
-        self.elapsed = time.time() - self.start_time
-        return False
+    return logger.is_enabled_for(logging.INFO)
 
 
 def _calculate_and_log_metrics(
@@ -120,7 +220,7 @@ def _calculate_and_log_metrics(
     Returns:
         Metrics dictionary
     """
-    model_config = getattr(config.llm, model_tier)
+    model_config = _TIER_CONFIGS[model_tier]
     metrics = _calculate_cost(
         usage=usage,
         cost_per_1k_input=model_config.cost_per_1k_input,
@@ -130,17 +230,18 @@ def _calculate_and_log_metrics(
     )
 
     # Simplified logging - just show key metrics, not full usage details
-    log_data = {
-        "execution_id": context["execution_id"],
-        "model": context["model"],
-        "tokens": usage.get("total_tokens", 0),
-        "response_time_ms": int(context["response_time"] * 1000),
-        **_format_cost_for_logging(metrics),
-    }
+    if _info_enabled(context["logger"]):
+        log_data = {
+            "execution_id": context["execution_id"],
+            "model": context["model"],
+            "tokens": usage.get("total_tokens", 0),
+            "response_time_ms": int(context["response_time"] * 1000),
+            "cost_usd": metrics.total_cost,
+        }
 
-    context["logger"].info(f"LLM {operation_type} successful", **log_data)
+        context["logger"].info(f"LLM {operation_type} successful", **log_data)
 
-    return metrics
+    return metrics._asdict()
 
 
 def _calculate_embedding_metrics(
@@ -165,17 +266,18 @@ def _calculate_embedding_metrics(
         model=context["model"],
     )
 
-    log_data = {
-        "execution_id": context["execution_id"],
-        "model": context["model"],
-        "usage": usage,
-        **context.get("vector_info", {}),
-        **_format_cost_for_logging(metrics),
-    }
+    if _info_enabled(context["logger"]):
+        log_data = {
+            "execution_id": context["execution_id"],
+            "model": context["model"],
+            "usage": usage,
+            **context.get("vector_info", {}),
+            "cost_usd": metrics.total_cost,
+        }
 
-    context["logger"].info(f"{operation_type} successful", **log_data)
+        context["logger"].info(f"{operation_type} successful", **log_data)
 
-    return metrics
+    return metrics._asdict()
 
 
 def _get_model_config(
@@ -197,58 +299,168 @@ def _get_model_config(
         Tuple of (model, temperature, max_tokens, model_tier)
     """
     if model is None:
-        tier_config = getattr(config.llm, default_tier)
-        return (
-            tier_config.model,
-            temperature or tier_config.temperature,
-            max_tokens or tier_config.max_tokens,
-            default_tier,
+        model, default_temperature, default_max_tokens = _TIER_DEFAULTS[default_tier]
+        tier = default_tier
+    else:
+        # Determine tier from model name
+        default_temperature, default_max_tokens, tier = _MODEL_DEFAULTS.get(
+            model, _UNKNOWN_MODEL_DEFAULTS
         )
 
-    # Determine tier from model name
-    if model == config.llm.small.model:
-        return (
-            model,
-            temperature or config.llm.small.temperature,
-            max_tokens or config.llm.small.max_tokens,
-            "small",
-        )
-    if model == config.llm.large.model:
-        return (
-            model,
-            temperature or config.llm.large.temperature,
-            max_tokens or config.llm.large.max_tokens,
-            "large",
-        )
-    if model == config.llm.medium.model:
-        return (
-            model,
-            temperature or config.llm.medium.temperature,
-            max_tokens or config.llm.medium.max_tokens,
-            "medium",
-        )
-    # Unknown model, use medium defaults
+    # Explicit zeros (e.g. temperature=0) are honored; only None falls back
     return (
         model,
-        temperature or config.llm.medium.temperature,
-        max_tokens or config.llm.medium.max_tokens,
-        "medium",
+        default_temperature if temperature is None else temperature,
+        default_max_tokens if max_tokens is None else max_tokens,
+        tier,
+    )
+
+
+def _split_llm_params(
+    llm_params: Optional[Dict[str, Any]], default_tier: str = "medium"
+) -> tuple:
+    """
+    Resolve model settings and separate passthrough API parameters.
+
+    Args:
+        llm_params: Caller's LLM parameters or None
+        default_tier: Default tier if no model is given ("small", "medium", "large")
+
+    Returns:
+        Tuple of (model, temperature, max_tokens, model_tier, extra_params), where
+        extra_params is a new dict of the remaining OpenAI API parameters
+    """
+    if not llm_params:
+        return (*_get_model_config(None, None, None, default_tier), {})
+
+    extra_params = {k: v for k, v in llm_params.items() if k not in _RESERVED_LLM_KEYS}
+    return (
+        *_get_model_config(
+            llm_params.get("model"),
+            llm_params.get("temperature"),
+            llm_params.get("max_tokens"),
+            default_tier,
+        ),
+        extra_params,
     )
 
 
-def _get_llm_client(
-    auth_config: Dict[str, Any], ssl_config: Dict[str, Any], model_tier: str = "medium"
-) -> OpenAI:
+@functools.lru_cache(maxsize=8)
+def _ssl_context(verify: bool, cert_path: Optional[str]) -> ssl.SSLContext:
+    """
+    Build (once per setting) the SSL context used by HTTP clients.
+
+    Loading a CA bundle parses every certificate in it, so contexts are
+    cached and shared instead of rebuilt for each new client.
+
+    Args:
+        verify: Whether to verify server certificates.
+        cert_path: Custom CA bundle, or None for system certificates.
+
+    Returns:
+        SSL context for httpx's verify argument.
+    """
+    if not verify:
+        # Disable SSL verification
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+    # Use custom certificate, or system certificates when cert_path is None
+    return ssl.create_default_context(cafile=cert_path)
+
+
+def _http_client_key(context: RuntimeContext, model_tier: str) -> Tuple:
+    """
+    Build the HTTP pool cache key from the settings baked into an httpx client.
+
+    Args:
+        context: Runtime context for the workflow.
+        model_tier: Model tier for timeout configuration.
+
+    Returns:
+        Tuple of (verify, cert_path, model_tier).
+    """
+    return (context.ssl_verify, context.ssl_cert_path, model_tier)
+
+
+def _http_client_kwargs(http_client_key: Tuple) -> Dict[str, Any]:
+    """
+    Build the httpx client arguments for an HTTP pool cache key.
+
+    Args:
+        http_client_key: Key from _http_client_key().
+
+    Returns:
+        Keyword arguments for httpx.Client or httpx.AsyncClient.
+    """
+    verify, cert_path, model_tier = http_client_key
+
+    # Get timeout based on model tier
+    timeout = _TIMEOUTS.get(model_tier, _TIMEOUTS["medium"])
+
+    # Configure HTTP client with a shared SSL context and a keep-alive pool
+    # sized for concurrent requests
+    return {
+        "timeout": httpx.Timeout(timeout=timeout),
+        "limits": HTTP_POOL_LIMITS,
+        "verify": _ssl_context(verify, cert_path),
+    }
+
+
+def _close_clients() -> None:
+    """Close the HTTP pools at interpreter exit to release their sockets."""
+    with _client_cache_lock:
+        for http_client in _http_clients.values():
+            http_client.close()
+        _http_clients.clear()
+        _client_cache.clear()
+        async_http_clients = list(_async_http_clients.values())
+        _async_http_clients.clear()
+        _async_client_cache.clear()
+
+    # Pools not already closed by aclose_clients() get a loop of their own
+    for http_client in async_http_clients:
+        if http_client.is_closed:
+            continue
+        try:
+            asyncio.run(http_client.aclose())
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass  # Their event loop is gone; the OS reclaims the sockets
+
+
+async def aclose_clients() -> None:
+    """
+    Close the async HTTP pools on the event loop that opened them.
+
+    Call from server shutdown while the loop is still running; whatever is
+    left at interpreter exit is handled by _close_clients().
+    """
+    with _client_cache_lock:
+        async_http_clients = list(_async_http_clients.values())
+        _async_http_clients.clear()
+        _async_client_cache.clear()
+
+    await asyncio.gather(
+        *(http_client.aclose() for http_client in async_http_clients),
+        return_exceptions=True,
+    )
+
+
+atexit.register(_close_clients)
+
+
+def _get_llm_client(context: RuntimeContext, model_tier: str = "medium") -> OpenAI:
     """
     Get or create an OpenAI client with proper configuration.
 
     Creates a cached OpenAI client configured with the appropriate
-    authentication and SSL settings. Clients are cached by auth token
-    to enable connection reuse.
+    authentication and SSL settings. One client is kept per SSL settings
+    and tier, on a shared HTTP connection pool; when the auth token rotates
+    the cached client is replaced, so old tokens leave nothing behind.
 
     Args:
-        auth_config: Authentication configuration from workflow.
-        ssl_config: SSL configuration from workflow.
+        context: Runtime context for the workflow.
         model_tier: Model tier for timeout configuration ("small", "medium", "large").
 
     Returns:
@@ -259,59 +471,99 @@ def _get_llm_client(
     """
     logger = get_logger()
 
-    # Use token as cache key
-    cache_key = auth_config.get("token", "no-auth")
+    cache_key = _http_client_key(context, model_tier)
+    auth_token = context.auth_token
+
+    # Return cached client if it carries the current token (lock-free fast path)
+    client = _client_cache.get(cache_key)
+    if client is not None and client.api_key == auth_token:
+        logger.debug("Using cached LLM client", model_tier=model_tier)
+        return client
+
+    with _client_cache_lock:
+        # Another thread may have built it while we waited
+        client = _client_cache.get(cache_key)
+        if client is not None and client.api_key == auth_token:
+            return client
+
+        # Reuse the HTTP pool for these SSL/timeout settings across tokens
+        http_client = _http_clients.get(cache_key)
+        if http_client is None:
+            http_client = httpx.Client(**_http_client_kwargs(cache_key))
+            _http_clients[cache_key] = http_client
+
+        # Create OpenAI client, replacing any client for a previous token
+        client = OpenAI(
+            api_key=auth_token,
+            base_url=config.llm.base_url,
+            http_client=http_client,
+        )
 
-    # Return cached client if exists
-    if cache_key in _client_cache:
-        logger.debug("Using cached LLM client", cache_key=cache_key[:8] + "...")
-        return _client_cache[cache_key]
+        # Cache the client
+        _client_cache[cache_key] = client
 
-    # Get timeout based on model tier
-    timeout_config = {
-        "small": config.llm.small.timeout,
-        "medium": config.llm.medium.timeout,
-        "large": config.llm.large.timeout,
-        "embedding": config.llm.embedding.timeout,
-    }
-    timeout = timeout_config.get(model_tier, config.llm.medium.timeout)
+    logger.info(
+        "Created new LLM client",
+        base_url=config.llm.base_url,
+        auth_method=context.auth_method,
+        ssl_verify=context.ssl_verify,
+        timeout=http_client.timeout.read,
+    )
 
-    # Configure HTTP client with SSL settings
-    http_client_kwargs = {
-        "timeout": httpx.Timeout(timeout=timeout),
-    }
+    return client
 
-    # Apply SSL configuration
-    if ssl_config.get("verify"):
-        if ssl_config.get("cert_path"):
-            # Use custom certificate
-            http_client_kwargs["verify"] = ssl_config["cert_path"]
-        else:
-            # Use system certificates
-            http_client_kwargs["verify"] = True
-    else:
-        # Disable SSL verification
-        http_client_kwargs["verify"] = False
 
-    # Create HTTP client
-    http_client = httpx.Client(**http_client_kwargs)
+def _get_async_llm_client(context: RuntimeContext, model_tier: str = "medium") -> AsyncOpenAI:
+    """
+    Get or create an AsyncOpenAI client with proper configuration.
 
-    # Create OpenAI client
-    client = OpenAI(
-        api_key=auth_config.get("token", "no-token"),
-        base_url=config.llm.base_url,
-        http_client=http_client,
-    )
+    Async counterpart of _get_llm_client, cached the same way. A single
+    client multiplexes many in-flight requests over its connection pool,
+    so callers can fan out with asyncio.gather instead of issuing calls
+    one after another.
+
+    Args:
+        context: Runtime context for the workflow.
+        model_tier: Model tier for timeout configuration ("small", "medium", "large").
+
+    Returns:
+        Configured AsyncOpenAI client instance.
+    """
+    logger = get_logger()
+
+    cache_key = _http_client_key(context, model_tier)
+    auth_token = context.auth_token
+
+    # Return cached client if it carries the current token (lock-free fast path)
+    client = _async_client_cache.get(cache_key)
+    if client is not None and client.api_key == auth_token:
+        logger.debug("Using cached async LLM client", model_tier=model_tier)
+        return client
+
+    with _client_cache_lock:
+        client = _async_client_cache.get(cache_key)
+        if client is not None and client.api_key == auth_token:
+            return client
+
+        http_client = _async_http_clients.get(cache_key)
+        if http_client is None:
+            http_client = httpx.AsyncClient(**_http_client_kwargs(cache_key))
+            _async_http_clients[cache_key] = http_client
+
+        client = AsyncOpenAI(
+            api_key=auth_token,
+            base_url=config.llm.base_url,
+            http_client=http_client,
+        )
 
-    # Cache the client
-    _client_cache[cache_key] = client
+        _async_client_cache[cache_key] = client
 
     logger.info(
-        "Created new LLM client",
+        "Created new async LLM client",
         base_url=config.llm.base_url,
-        auth_method=auth_config.get("method"),
-        ssl_verify=ssl_config.get("verify"),
-        timeout=timeout,
+        auth_method=context.auth_method,
+        ssl_verify=context.ssl_verify,
+        timeout=http_client.timeout.read,
     )
 
     return client
@@ -319,7 +571,7 @@ def _get_llm_client(
 
 def complete(
     messages: List[Dict[str, str]],
-    context: Dict[str, Any],
+    context: Union[RuntimeContext, Dict[str, Any]],
     llm_params: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
@@ -330,7 +582,7 @@ def complete(
 
     Args:
         messages: List of message dictionaries with 'role' and 'content'.
-        context: Runtime context containing:
+        context: RuntimeContext, or a dict containing:
                  - execution_id: Unique identifier for this execution
                  - auth_config: Authentication configuration
                  - ssl_config: SSL configuration
@@ -353,50 +605,124 @@ def complete(
         Exception: If the API call fails.
     """
     logger = get_logger()
-    llm_params = llm_params or {}
+    context = _runtime_context(context)
+    # Get model configuration using helper
+    model, temperature, max_tokens, model_tier, extra_params = _split_llm_params(llm_params)
 
+    if _info_enabled(logger):
+        logger.info(
+            "Generating LLM completion",
+            execution_id=context.execution_id,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            message_count=len(messages),
+        )
+
+    try:
+        client = _get_llm_client(context, model_tier)
+
+        # Time the API call
+        start_time = time.perf_counter()
+        raw_response = client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra_params,
+        )
+        elapsed = time.perf_counter() - start_time
+
+        # Parse the body straight to a dict, skipping the SDK's pydantic model
+        response_dict = orjson.loads(raw_response.content)
+
+        # Calculate and log metrics
+        response_dict["metrics"] = _calculate_and_log_metrics(
+            usage=response_dict.get("usage") or {},
+            model_tier=model_tier,
+            context={
+                "model": model,
+                "response_time": elapsed,
+                "execution_id": context.execution_id,
+                "logger": logger,
+            },
+            operation_type="completion",
+        )
+
+        return response_dict
+
+    except Exception as e:
+        logger.error(
+            "LLM completion failed",
+            execution_id=context.execution_id,
+            model=model,
+            error=str(e),
+        )
+        raise
+
+
+async def acomplete(
+    messages: List[Dict[str, str]],
+    context: Union[RuntimeContext, Dict[str, Any]],
+    llm_params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Generate a non-streaming completion from the LLM without blocking the event loop.
+
+    Async version of complete(); several calls can run concurrently, e.g.
+    ``await asyncio.gather(*(acomplete(m, context) for m in batches))``.
+
+    Args:
+        messages: List of message dictionaries with 'role' and 'content'.
+        context: Runtime context (see complete()).
+        llm_params: Optional LLM parameters (see complete()).
+
+    Returns:
+        Response dictionary containing the completion, as returned by complete().
+
+    Raises:
+        Exception: If the API call fails.
+    """
+    logger = get_logger()
+    context = _runtime_context(context)
     # Get model configuration using helper
-    model, temperature, max_tokens, model_tier = _get_model_config(
-        llm_params.get("model"), llm_params.get("temperature"), llm_params.get("max_tokens")
-    )
+    model, temperature, max_tokens, model_tier, extra_params = _split_llm_params(llm_params)
 
-    logger.info(
-        "Generating LLM completion",
-        execution_id=context["execution_id"],
-        model=model,
-        temperature=temperature,
-        max_tokens=max_tokens,
-        message_count=len(messages),
-    )
+    if _info_enabled(logger):
+        logger.info(
+            "Generating LLM completion",
+            execution_id=context.execution_id,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            message_count=len(messages),
+        )
 
     try:
-        client = _get_llm_client(context["auth_config"], context["ssl_config"], model_tier)
+        client = _get_async_llm_client(context, model_tier)
 
         # Time the API call
-        with ResponseTimer() as timer:
-            response = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **{
-                    k: v
-                    for k, v in llm_params.items()
-                    if k not in ["model", "temperature", "max_tokens"]
-                },
-            )
+        start_time = time.perf_counter()
+        raw_response = await client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra_params,
+        )
+        elapsed = time.perf_counter() - start_time
 
-        # Convert response to dict
-        response_dict = response.model_dump()
+        # Parse the body straight to a dict, skipping the SDK's pydantic model
+        response_dict = orjson.loads(raw_response.content)
 
         # Calculate and log metrics
         response_dict["metrics"] = _calculate_and_log_metrics(
-            usage=response_dict.get("usage", {}),
+            usage=response_dict.get("usage") or {},
             model_tier=model_tier,
             context={
                 "model": model,
-                "response_time": timer.elapsed,
-                "execution_id": context["execution_id"],
+                "response_time": elapsed,
+                "execution_id": context.execution_id,
                 "logger": logger,
             },
             operation_type="completion",
@@ -407,17 +733,82 @@ def complete(
     except Exception as e:
         logger.error(
             "LLM completion failed",
-            execution_id=context["execution_id"],
+            execution_id=context.execution_id,
             model=model,
             error=str(e),
         )
         raise
 
 
-def stream(  # pylint: disable=too-many-locals
-    # Complex streaming logic requires multiple local vars for metrics, timing, and state tracking.
+def _stream_chunk_to_dict(chunk: Any) -> Dict[str, Any]:
+    """
+    Convert a streaming chunk to the dict shape produced by model_dump().
+
+    A full model_dump() walks the whole pydantic tree for every token.
+    Text deltas only need a handful of fields, so those are read directly;
+    chunks carrying tool calls or other rarely used fields still go through
+    model_dump() so nothing is lost.
+
+    Args:
+        chunk: ChatCompletionChunk from the OpenAI stream
+
+    Returns:
+        Dictionary with id, created, model, choices and usage
+    """
+    choices = []
+    for choice in chunk.choices:
+        delta = choice.delta
+        if delta.tool_calls or delta.function_call or delta.refusal or choice.logprobs:
+            return chunk.model_dump()
+        choices.append(
+            {
+                "index": choice.index,
+                "delta": {"role": delta.role, "content": delta.content},
+                "finish_reason": choice.finish_reason,
+            }
+        )
+
+    usage = chunk.usage
+    return {
+        "id": chunk.id,
+        "created": chunk.created,
+        "model": chunk.model,
+        "choices": choices,
+        "usage": usage.model_dump() if usage is not None else None,
+    }
+
+
+def _adjust_for_o_series(
+    model: str, temperature: float, extra_params: Dict[str, Any], logger
+) -> float:
+    """
+    Drop sampling parameters that o-series models reject.
+
+    Args:
+        model: Model name.
+        temperature: Requested temperature.
+        extra_params: Extra API parameters; unsupported keys are removed in place.
+        logger: Logger for the adjustment notice.
+
+    Returns:
+        Temperature to send (always 1.0 for o-series models).
+    """
+    # Check if this is an o-series model
+    if not (model.startswith('o') and len(model) > 1 and model[1].isdigit()):
+        return temperature
+
+    if _info_enabled(logger):
+        logger.info(f"O-series model {model} detected, adjusting parameters")
+    # O-series models don't support temperature, top_p, etc.
+    for unsupported_param in ['temperature', 'top_p', 'presence_penalty', 'frequency_penalty',
+                               'logprobs', 'top_logprobs', 'logit_bias']:
+        extra_params.pop(unsupported_param, None)
+    return 1.0  # Must be 1 for o-series
+
+
+def stream(
     messages: List[Dict[str, str]],
-    context: Dict[str, Any],
+    context: Union[RuntimeContext, Dict[str, Any]],
     llm_params: Optional[Dict[str, Any]] = None,
     model_size: str = "large",
 ) -> Generator[Dict[str, Any], None, None]:
@@ -429,7 +820,7 @@ def stream(  # pylint: disable=too-many-locals
 
     Args:
         messages: List of message dictionaries with 'role' and 'content'.
-        context: Runtime context containing:
+        context: RuntimeContext, or a dict containing:
                  - execution_id: Unique identifier for this execution
                  - auth_config: Authentication configuration
                  - ssl_config: SSL configuration
@@ -448,45 +839,176 @@ def stream(  # pylint: disable=too-many-locals
         #     "created": 1234567890
         # }
 
+    Raises:
+        Exception: If the API call fails.
+    """
+    yield from _stream(messages, context, llm_params, model_size, raw=False)
+
+
+def stream_raw(
+    messages: List[Dict[str, str]],
+    context: Union[RuntimeContext, Dict[str, Any]],
+    llm_params: Optional[Dict[str, Any]] = None,
+    model_size: str = "large",
+) -> Generator[bytes, None, None]:
+    """
+    Generate a streaming completion as pre-serialized JSON.
+
+    Same as stream(), but each chunk is serialized straight from the SDK
+    model with model_dump_json(), without building an intermediate dict.
+    Suited to callers that forward chunks (e.g. as SSE) rather than read them.
+
+    Args:
+        messages: List of message dictionaries with 'role' and 'content'.
+        context: RuntimeContext, or a dict (see stream()).
+        llm_params: Optional LLM parameters (see stream()).
+        model_size: Default tier when llm_params has no model.
+
+    Yields:
+        UTF-8 JSON for each chunk, then for the usage_stats record (see stream()).
+
+        # Yields: b'{"id":"chatcmpl-...","choices":[{"delta":{"content":"Hello"},...}],...}'
+
+    Raises:
+        Exception: If the API call fails.
+    """
+    yield from _stream(messages, context, llm_params, model_size, raw=True)
+
+
+async def astream(
+    messages: List[Dict[str, str]],
+    context: Union[RuntimeContext, Dict[str, Any]],
+    llm_params: Optional[Dict[str, Any]] = None,
+    model_size: str = "large",
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Generate a streaming completion from the LLM without blocking the event loop.
+
+    Async version of stream(); chunks are read on the shared AsyncOpenAI
+    client, so concurrent chats share one event loop instead of each
+    holding a worker thread for the length of the response.
+
+    Args:
+        messages: List of message dictionaries with 'role' and 'content'.
+        context: RuntimeContext, or a dict (see stream()).
+        llm_params: Optional LLM parameters (see stream()).
+        model_size: Default tier when llm_params has no model.
+
+    Yields:
+        Chunk dictionaries, then the usage_stats record, as stream() does.
+
     Raises:
         Exception: If the API call fails.
     """
     logger = get_logger()
-    llm_params = llm_params or {}
+    context = _runtime_context(context)
+    model, temperature, max_tokens, model_tier, extra_params = _split_llm_params(
+        llm_params, default_tier=model_size
+    )
+    temperature = _adjust_for_o_series(model, temperature, extra_params, logger)
 
+    if _info_enabled(logger):
+        logger.info(
+            "Starting LLM streaming",
+            execution_id=context.execution_id,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            message_count=len(messages),
+        )
+
+    chunk_count = 0
+    try:
+        client = _get_async_llm_client(context, model_tier)
+
+        start_time = time.perf_counter()
+        stream_response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},  # Request usage stats in stream
+            **extra_params,
+        )
+
+        accumulated_usage = None
+        async for chunk in stream_response:
+            chunk_count += 1
+            # Accumulate usage from the final chunk (if present)
+            if chunk.usage is not None:
+                accumulated_usage = chunk.usage.model_dump()
+            yield _stream_chunk_to_dict(chunk)
+
+        elapsed = time.perf_counter() - start_time
+
+        if accumulated_usage:
+            metrics = _calculate_and_log_metrics(
+                usage=accumulated_usage,
+                model_tier=model_tier,
+                context={
+                    "model": model,
+                    "response_time": elapsed,
+                    "execution_id": context.execution_id,
+                    "logger": logger,
+                },
+                operation_type=f"streaming completed (chunks={chunk_count})",
+            )
+            yield {"usage": accumulated_usage, "metrics": metrics, "type": "usage_stats"}
+        elif _info_enabled(logger):
+            logger.info(
+                "LLM streaming completed without usage data",
+                execution_id=context.execution_id,
+                model=model,
+                chunks=chunk_count,
+                response_time=elapsed,
+            )
+
+    except Exception as e:
+        logger.error(
+            "LLM streaming failed",
+            execution_id=context.execution_id,
+            model=model,
+            error=str(e),
+            chunk_count=chunk_count,
+            exc_info=True,
+        )
+        raise
+
+
+def _stream(  # pylint: disable=too-many-locals
+    # Complex streaming logic requires multiple local vars for metrics, timing, and state tracking.
+    messages: List[Dict[str, str]],
+    context: Union[RuntimeContext, Dict[str, Any]],
+    llm_params: Optional[Dict[str, Any]],
+    model_size: str,
+    raw: bool,
+) -> Generator[Any, None, None]:
+    """Shared implementation of stream() and stream_raw(); raw selects JSON bytes output."""
+    logger = get_logger()
+    context = _runtime_context(context)
     # Get model configuration using helper - use model_size as default tier
-    model, temperature, max_tokens, model_tier = _get_model_config(
-        llm_params.get("model"), llm_params.get("temperature"), llm_params.get("max_tokens"),
-        default_tier=model_size
+    model, temperature, max_tokens, model_tier, extra_params = _split_llm_params(
+        llm_params, default_tier=model_size
     )
     
-    # Check if this is an o-series model
-    is_o_series = model.startswith('o') and len(model) > 1 and model[1].isdigit()
-    
-    # Override parameters for o-series models
-    if is_o_series:
-        logger.info(f"O-series model {model} detected, adjusting parameters")
-        # O-series models don't support temperature, top_p, etc.
-        temperature = 1.0  # Must be 1 for o-series
-        # Remove unsupported parameters
-        for unsupported_param in ['temperature', 'top_p', 'presence_penalty', 'frequency_penalty', 
-                                   'logprobs', 'top_logprobs', 'logit_bias']:
-            llm_params.pop(unsupported_param, None)
+    temperature = _adjust_for_o_series(model, temperature, extra_params, logger)
 
-    logger.info(
-        "Starting LLM streaming",
-        execution_id=context["execution_id"],
-        model=model,
-        temperature=temperature,
-        max_tokens=max_tokens,
-        message_count=len(messages),
-    )
+    if _info_enabled(logger):
+        logger.info(
+            "Starting LLM streaming",
+            execution_id=context.execution_id,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            message_count=len(messages),
+        )
 
     try:
-        client = _get_llm_client(context["auth_config"], context["ssl_config"], model_tier)
+        client = _get_llm_client(context, model_tier)
 
         # Start timing
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Remove our known params, pass rest as kwargs
         stream_response = client.chat.completions.create(
@@ -496,48 +1018,41 @@ def stream(  # pylint: disable=too-many-locals
             max_tokens=max_tokens,
             stream=True,
             stream_options={"include_usage": True},  # Request usage stats in stream
-            **{
-                k: v
-                for k, v in llm_params.items()
-                if k not in ["model", "temperature", "max_tokens"]
-            },
+            **extra_params,
         )
 
         chunk_count = 0
         accumulated_usage = None
         last_chunk_content = ""
-        total_content = ""
+        total_content_length = 0
 
         for chunk in stream_response:
             chunk_count += 1
             try:
-                chunk_dict = chunk.model_dump()
-                
                 # Track content for debugging
-                if chunk_dict.get("choices") and len(chunk_dict["choices"]) > 0:
-                    delta = chunk_dict["choices"][0].get("delta", {})
-                    content = delta.get("content", "")
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content
                     if content:
                         last_chunk_content = content
-                        total_content += content
+                        total_content_length += len(content)
                         # Remove verbose chunk logging - only log in error scenarios
 
                 # Accumulate usage from the final chunk (if present)
-                if chunk_dict.get("usage"):
-                    accumulated_usage = chunk_dict["usage"]
+                if chunk.usage is not None:
+                    accumulated_usage = chunk.usage.model_dump()
 
-                yield chunk_dict
+                yield chunk.model_dump_json().encode() if raw else _stream_chunk_to_dict(chunk)
             except Exception as chunk_error:
                 logger.error(
                     f"Error processing chunk {chunk_count}: {str(chunk_error)}",
-                    execution_id=context["execution_id"],
+                    execution_id=context.execution_id,
                     last_content=repr(last_chunk_content),
-                    total_length=len(total_content)
+                    total_length=total_content_length
                 )
                 raise
 
         # Calculate elapsed time
-        elapsed = time.time() - start_time
+        elapsed = time.perf_counter() - start_time
 
         # Log streaming completion and calculate metrics
         if accumulated_usage:
@@ -547,35 +1062,39 @@ def stream(  # pylint: disable=too-many-locals
                 context={
                     "model": model,
                     "response_time": elapsed,
-                    "execution_id": context["execution_id"],
+                    "execution_id": context.execution_id,
                     "logger": logger,
                 },
                 operation_type=f"streaming completed (chunks={chunk_count})",
             )
             # Yield a final chunk with usage information for the app to process
-            yield {
+            usage_stats = {
                 "usage": accumulated_usage,
                 "metrics": metrics,
                 "type": "usage_stats"
             }
+            yield orjson.dumps(usage_stats) if raw else usage_stats
         else:
-            logger.info(
-                "LLM streaming completed without usage data",
-                execution_id=context["execution_id"],
-                model=model,
-                chunks=chunk_count,
-                response_time=elapsed,
-            )
+            if _info_enabled(logger):
+                logger.info(
+                    "LLM streaming completed without usage data",
+                    execution_id=context.execution_id,
+                    model=model,
+                    chunks=chunk_count,
+                    response_time=elapsed,
+                )
 
     except Exception as e:
         logger.error(
             "LLM streaming failed",
-            execution_id=context["execution_id"],
+            execution_id=context.execution_id,
             model=model,
             error=str(e),
             chunk_count=chunk_count,
             last_chunk=repr(last_chunk_content[:200]) if 'last_chunk_content' in locals() else "N/A",
-            total_content_length=len(total_content) if 'total_content' in locals() else 0,
+            total_content_length=(
+                total_content_length if 'total_content_length' in locals() else 0
+            ),
             exc_info=True  # Include full stack trace
         )
         raise
@@ -584,7 +1103,7 @@ def stream(  # pylint: disable=too-many-locals
 def complete_with_tools(
     messages: List[Dict[str, str]],
     tools: List[Dict[str, Any]],
-    context: Dict[str, Any],
+    context: Union[RuntimeContext, Dict[str, Any]],
     llm_params: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
@@ -596,7 +1115,7 @@ def complete_with_tools(
     Args:
         messages: List of message dictionaries with 'role' and 'content'.
         tools: List of tool definitions for function calling.
-        context: Runtime context containing:
+        context: RuntimeContext, or a dict containing:
                  - execution_id: Unique identifier for this execution
                  - auth_config: Authentication configuration
                  - ssl_config: SSL configuration
@@ -624,60 +1143,54 @@ def complete_with_tools(
         Exception: If the API call fails.
     """
     logger = get_logger()
-    llm_params = llm_params or {}
-
+    context = _runtime_context(context)
     # Get model configuration using helper (default to large for tools)
-    model, temperature, max_tokens, model_tier = _get_model_config(
-        llm_params.get("model"),
-        llm_params.get("temperature"),
-        llm_params.get("max_tokens"),
-        default_tier="large",  # Tools need better reasoning
+    model, temperature, max_tokens, model_tier, extra_params = _split_llm_params(
+        llm_params, default_tier="large"  # Tools need better reasoning
     )
 
-    logger.info(
-        "Generating LLM completion with tools",
-        execution_id=context["execution_id"],
-        model=model,
-        temperature=temperature,
-        max_tokens=max_tokens,
-        message_count=len(messages),
-        tool_count=len(tools),
-    )
+    if _info_enabled(logger):
+        logger.info(
+            "Generating LLM completion with tools",
+            execution_id=context.execution_id,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            message_count=len(messages),
+            tool_count=len(tools),
+        )
 
     try:
-        client = _get_llm_client(context["auth_config"], context["ssl_config"], model_tier)
+        client = _get_llm_client(context, model_tier)
 
         # Time the API call
-        with ResponseTimer() as timer:
-            response = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                tools=tools,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **{
-                    k: v
-                    for k, v in llm_params.items()
-                    if k not in ["model", "temperature", "max_tokens"]
-                },
-            )
+        start_time = time.perf_counter()
+        raw_response = client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=messages,
+            tools=tools,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra_params,
+        )
+        elapsed = time.perf_counter() - start_time
 
-        # Convert response to dict
-        response_dict = response.model_dump()
+        # Parse the body straight to a dict, skipping the SDK's pydantic model
+        response_dict = orjson.loads(raw_response.content)
 
         # Check if tools were called
         has_tool_calls = bool(
-            response_dict.get("choices", [{}])[0].get("message", {}).get("tool_calls")
+            (response_dict.get("choices") or [{}])[0].get("message", {}).get("tool_calls")
         )
 
         # Calculate and log metrics
         response_dict["metrics"] = _calculate_and_log_metrics(
-            usage=response_dict.get("usage", {}),
+            usage=response_dict.get("usage") or {},
             model_tier=model_tier,
             context={
                 "model": model,
-                "response_time": timer.elapsed,
-                "execution_id": context["execution_id"],
+                "response_time": elapsed,
+                "execution_id": context.execution_id,
                 "logger": logger,
             },
             operation_type=f"tool completion (has_tool_calls={has_tool_calls})",
@@ -688,16 +1201,80 @@ def complete_with_tools(
     except Exception as e:
         logger.error(
             "LLM tool completion failed",
-            execution_id=context["execution_id"],
+            execution_id=context.execution_id,
             model=model,
             error=str(e),
         )
         raise
 
 
+def _embedding_response_to_dict(response: Any) -> Dict[str, Any]:
+    """
+    Convert an embeddings response to the dict shape produced by model_dump().
+
+    model_dump() deep-copies every vector, which for large batches means
+    rebuilding millions of floats. The SDK has already decoded the vectors
+    into lists, so those lists are reused as-is.
+
+    Args:
+        response: CreateEmbeddingResponse from the OpenAI client
+
+    Returns:
+        Dictionary with data, model, object and usage
+    """
+    return {
+        "data": [
+            {"embedding": item.embedding, "index": item.index, "object": item.object}
+            for item in response.data
+        ],
+        "model": response.model,
+        "object": response.object,
+        "usage": response.usage.model_dump() if response.usage is not None else {},
+    }
+
+
+def _embedding_batch_response_to_dict(response: Any) -> Dict[str, Any]:
+    """
+    Convert a batch embeddings response to a dict holding one vector matrix.
+
+    Vectors are packed into a contiguous float32 array rather than a list of
+    Python float lists, which is several times smaller for large batches.
+    Base64 payloads are decoded directly; float lists (when the caller asked
+    for encoding_format="float") are converted.
+
+    Args:
+        response: CreateEmbeddingResponse from the OpenAI client
+
+    Returns:
+        Dictionary with vectors, data (None), model, object and usage
+    """
+    items = sorted(response.data, key=lambda item: item.index)
+    if items:
+        vectors = np.stack(
+            [
+                (
+                    np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+                    if isinstance(item.embedding, str)
+                    else np.asarray(item.embedding, dtype=np.float32)
+                )
+                for item in items
+            ]
+        )
+    else:
+        vectors = np.empty((0, 0), dtype=np.float32)
+
+    return {
+        "vectors": vectors,
+        "data": None,
+        "model": response.model,
+        "object": response.object,
+        "usage": response.usage.model_dump() if response.usage is not None else {},
+    }
+
+
 def embed(
     input_text: str,
-    context: Dict[str, Any],
+    context: Union[RuntimeContext, Dict[str, Any]],
     embedding_params: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
@@ -709,7 +1286,7 @@ def embed(
 
     Args:
         input_text: Text to generate embedding for.
-        context: Runtime context containing:
+        context: RuntimeContext, or a dict containing:
                  - execution_id: Unique identifier for this execution
                  - auth_config: Authentication configuration
                  - ssl_config: SSL configuration
@@ -735,6 +1312,7 @@ def embed(
         Exception: If the API call fails.
     """
     logger = get_logger()
+    context = _runtime_context(context)
 
     # Extract embedding parameters with defaults
     if embedding_params is None:
@@ -751,32 +1329,34 @@ def embed(
     if "text-embedding-3" in model and dimensions:
         kwargs["dimensions"] = dimensions
 
-    logger.info(
-        "Generating text embedding",
-        execution_id=context["execution_id"],
-        model=model,
-        dimensions=dimensions if "text-embedding-3" in model else "default",
-        input_length=len(input_text),
-    )
+    if _info_enabled(logger):
+        logger.info(
+            "Generating text embedding",
+            execution_id=context.execution_id,
+            model=model,
+            dimensions=dimensions if "text-embedding-3" in model else "default",
+            input_length=len(input_text),
+        )
 
     try:
         # Use embedding timeout for client
-        client = _get_llm_client(context["auth_config"], context["ssl_config"], "embedding")
+        client = _get_llm_client(context, "embedding")
 
         # Time the API call
-        with ResponseTimer() as timer:
-            response = client.embeddings.create(model=model, input=input_text, **kwargs)
+        start_time = time.perf_counter()
+        response = client.embeddings.create(model=model, input=input_text, **kwargs)
+        elapsed = time.perf_counter() - start_time
 
         # Convert response to dict
-        response_dict = response.model_dump()
+        response_dict = _embedding_response_to_dict(response)
 
         # Calculate and log metrics
         response_dict["metrics"] = _calculate_embedding_metrics(
             usage=response_dict.get("usage", {}),
             context={
                 "model": model,
-                "response_time": timer.elapsed,
-                "execution_id": context["execution_id"],
+                "response_time": elapsed,
+                "execution_id": context.execution_id,
                 "logger": logger,
                 "vector_info": {"vector_length": len(response_dict["data"][0]["embedding"])},
             },
@@ -788,7 +1368,7 @@ def embed(
     except Exception as e:
         logger.error(
             "Embedding generation failed",
-            execution_id=context["execution_id"],
+            execution_id=context.execution_id,
             model=model,
             error=str(e),
         )
@@ -797,7 +1377,7 @@ def embed(
 
 def embed_batch(
     input_texts: List[str],
-    context: Dict[str, Any],
+    context: Union[RuntimeContext, Dict[str, Any]],
     embedding_params: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
@@ -808,7 +1388,7 @@ def embed_batch(
 
     Args:
         input_texts: List of texts to generate embeddings for.
-        context: Runtime context containing:
+        context: RuntimeContext, or a dict containing:
                  - execution_id: Unique identifier for this execution
                  - auth_config: Authentication configuration
                  - ssl_config: SSL configuration
@@ -818,14 +1398,12 @@ def embed_batch(
                           - Additional OpenAI API parameters
 
     Returns:
-        Response dictionary containing embedding vectors for all inputs.
+        Response dictionary containing embedding vectors for all inputs as a
+        float32 matrix, one row per input in input order.
 
         # Returns: {
-        #     "data": [
-        #         {"embedding": [...], "index": 0, "object": "embedding"},
-        #         {"embedding": [...], "index": 1, "object": "embedding"},
-        #         ...
-        #     ],
+        #     "vectors": np.ndarray of shape (len(input_texts), dimensions), float32,
+        #     "data": None,
         #     "model": "text-embedding-3-large",
         #     "usage": {"prompt_tokens": 100, "total_tokens": 100}
         # }
@@ -834,6 +1412,7 @@ def embed_batch(
         Exception: If the API call fails.
     """
     logger = get_logger()
+    context = _runtime_context(context)
 
     # Extract embedding parameters with defaults
     if embedding_params is None:
@@ -850,39 +1429,138 @@ def embed_batch(
     if "text-embedding-3" in model and dimensions:
         kwargs["dimensions"] = dimensions
 
-    logger.info(
-        "Generating batch embeddings",
-        execution_id=context["execution_id"],
-        model=model,
-        dimensions=dimensions if "text-embedding-3" in model else "default",
-        batch_size=len(input_texts),
-        total_chars=sum(len(text) for text in input_texts),
-    )
+    # Raw float32 bytes are decoded straight into the vector matrix
+    kwargs.setdefault("encoding_format", "base64")
+
+    if _info_enabled(logger):
+        logger.info(
+            "Generating batch embeddings",
+            execution_id=context.execution_id,
+            model=model,
+            dimensions=dimensions if "text-embedding-3" in model else "default",
+            batch_size=len(input_texts),
+            total_chars=sum(len(text) for text in input_texts),
+        )
 
     try:
         # Use embedding timeout for client
-        client = _get_llm_client(context["auth_config"], context["ssl_config"], "embedding")
+        client = _get_llm_client(context, "embedding")
 
         # Time the API call
-        with ResponseTimer() as timer:
-            response = client.embeddings.create(model=model, input=input_texts, **kwargs)
+        start_time = time.perf_counter()
+        response = client.embeddings.create(model=model, input=input_texts, **kwargs)
+        elapsed = time.perf_counter() - start_time
 
-        # Convert response to dict
-        response_dict = response.model_dump()
+        # Convert response to dict with an (N, D) float32 vector matrix
+        response_dict = _embedding_batch_response_to_dict(response)
+        vectors = response_dict["vectors"]
+
+        # Calculate and log metrics
+        response_dict["metrics"] = _calculate_embedding_metrics(
+            usage=response_dict.get("usage", {}),
+            context={
+                "model": model,
+                "response_time": elapsed,
+                "execution_id": context.execution_id,
+                "logger": logger,
+                "vector_info": {
+                    "vectors_generated": vectors.shape[0],
+                    "vector_length": vectors.shape[1],
+                },
+            },
+            operation_type="Batch embedding generation",
+        )
+
+        return response_dict
+
+    except Exception as e:
+        logger.error(
+            "Batch embedding generation failed",
+            execution_id=context.execution_id,
+            model=model,
+            batch_size=len(input_texts),
+            error=str(e),
+        )
+        raise
+
+
+async def aembed_batch(
+    input_texts: List[str],
+    context: Union[RuntimeContext, Dict[str, Any]],
+    embedding_params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Generate embeddings for multiple texts without blocking the event loop.
+
+    Async version of embed_batch(); large inputs can be split and the
+    parts awaited together with asyncio.gather.
+
+    Args:
+        input_texts: List of texts to generate embeddings for.
+        context: Runtime context (see embed_batch()).
+        embedding_params: Optional embedding parameters (see embed_batch()).
+
+    Returns:
+        Response dictionary containing embedding vectors, as returned by embed_batch().
+
+    Raises:
+        Exception: If the API call fails.
+    """
+    logger = get_logger()
+    context = _runtime_context(context)
+
+    # Extract embedding parameters with defaults
+    if embedding_params is None:
+        embedding_params = {}
+
+    # Get embedding configuration
+    model = embedding_params.get("model", config.llm.embedding.model)
+    dimensions = embedding_params.get("dimensions", config.llm.embedding.dimensions)
+
+    # Remove our known params, pass rest as kwargs
+    kwargs = {k: v for k, v in embedding_params.items() if k not in ["model", "dimensions"]}
+
+    # Add dimensions if supported by the model
+    if "text-embedding-3" in model and dimensions:
+        kwargs["dimensions"] = dimensions
+
+    # Raw float32 bytes are decoded straight into the vector matrix
+    kwargs.setdefault("encoding_format", "base64")
+
+    if _info_enabled(logger):
+        logger.info(
+            "Generating batch embeddings",
+            execution_id=context.execution_id,
+            model=model,
+            dimensions=dimensions if "text-embedding-3" in model else "default",
+            batch_size=len(input_texts),
+            total_chars=sum(len(text) for text in input_texts),
+        )
+
+    try:
+        # Use embedding timeout for client
+        client = _get_async_llm_client(context, "embedding")
+
+        # Time the API call
+        start_time = time.perf_counter()
+        response = await client.embeddings.create(model=model, input=input_texts, **kwargs)
+        elapsed = time.perf_counter() - start_time
+
+        # Convert response to dict with an (N, D) float32 vector matrix
+        response_dict = _embedding_batch_response_to_dict(response)
+        vectors = response_dict["vectors"]
 
         # Calculate and log metrics
         response_dict["metrics"] = _calculate_embedding_metrics(
             usage=response_dict.get("usage", {}),
             context={
                 "model": model,
-                "response_time": timer.elapsed,
-                "execution_id": context["execution_id"],
+                "response_time": elapsed,
+                "execution_id": context.execution_id,
                 "logger": logger,
                 "vector_info": {
-                    "vectors_generated": len(response_dict["data"]),
-                    "vector_length": (
-                        len(response_dict["data"][0]["embedding"]) if response_dict["data"] else 0
-                    ),
+                    "vectors_generated": vectors.shape[0],
+                    "vector_length": vectors.shape[1],
                 },
             },
             operation_type="Batch embedding generation",
@@ -893,7 +1571,7 @@ def embed_batch(
     except Exception as e:
         logger.error(
             "Batch embedding generation failed",
-            execution_id=context["execution_id"],
+            execution_id=context.execution_id,
             model=model,
             batch_size=len(input_texts),
             error=str(e),
@@ -901,7 +1579,155 @@ def embed_batch(
         raise
 
 
-def check_connection(context: Dict[str, Any]) -> Dict[str, Any]:
+def _embed_coalesced_batch(
+    items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+) -> List[np.ndarray]:
+    """
+    Embed a coalesced batch of texts with a single embed_batch() call.
+
+    Args:
+        items: (input_text, context, embedding_params) tuples from one bucket
+
+    Returns:
+        Embedding vectors in the same order as items
+    """
+    # The newest context carries the freshest auth token at flush time
+    _, context, embedding_params = items[-1]
+    response = embed_batch([text for text, _, _ in items], context, embedding_params)
+    return list(response["vectors"])
+
+
+async def embed_coalesced(
+    input_text: str,
+    context: Union[RuntimeContext, Dict[str, Any]],
+    embedding_params: Optional[Dict[str, Any]] = None,
+) -> np.ndarray:
+    """
+    Embed a single text, sharing one API request with concurrent callers.
+
+    Calls arriving within a few milliseconds of each other are sent as one
+    embed_batch() request instead of one round trip each. Calls are grouped
+    by model and dimensions, so the batchers stay bounded as tokens rotate;
+    the latest caller's context (and so its auth token) and remaining
+    embedding_params are used for the whole request, so concurrent callers
+    in a group must agree on the SSL settings and params.
+
+    Args:
+        input_text: Text to generate embedding for.
+        context: Runtime context (see embed()).
+        embedding_params: Optional embedding parameters (see embed()).
+
+    Returns:
+        Embedding vector for input_text (float32, one row of the batch matrix).
+
+        # Returns: np.ndarray([0.123, -0.456, ...], dtype=float32)
+
+    Raises:
+        Exception: If the batched API call fails.
+    """
+    context = _runtime_context(context)
+    embedding_params = embedding_params or {}
+    bucket = (
+        embedding_params.get("model", config.llm.embedding.model),
+        embedding_params.get("dimensions", config.llm.embedding.dimensions),
+    )
+
+    batcher = _embedding_batchers.get(bucket)
+    if batcher is None:
+        batcher = MicroBatcher(
+            _embed_coalesced_batch,
+            max_batch_size=EMBED_COALESCE_MAX_BATCH,
+            max_wait_ms=EMBED_COALESCE_WAIT_MS,
+        )
+        _embedding_batchers[bucket] = batcher
+
+    return await batcher.submit((input_text, context, embedding_params))
+
+
+def warm_llm_clients(
+    context: Union[RuntimeContext, Dict[str, Any]],
+    model_tiers: Tuple[str, ...] = ("small", "medium", "large"),
+) -> None:
+    """
+    Create LLM clients and open their connections ahead of the first request.
+
+    Each tier has its own connection pool, so a cheap models.list() call is
+    made per tier to complete the TCP and TLS handshakes and leave a
+    keep-alive connection in the pool. Failures are logged and ignored;
+    the real request will retry the connection anyway.
+
+    Args:
+        context: RuntimeContext, or a dict containing execution_id,
+                 auth_config and ssl_config.
+        model_tiers: Tiers to warm.
+    """
+    logger = get_logger()
+    context = _runtime_context(context)
+
+    for model_tier in model_tiers:
+        start_time = time.perf_counter()
+        try:
+            _get_llm_client(context, model_tier).models.list(timeout=2.0)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Warm-up is best effort; the first real call will surface real errors.
+            logger.warning(
+                "LLM client warm-up failed",
+                execution_id=context.execution_id,
+                model_tier=model_tier,
+                error=str(e),
+            )
+            continue
+        logger.debug(
+            "LLM client warmed",
+            execution_id=context.execution_id,
+            model_tier=model_tier,
+            elapsed_ms=int((time.perf_counter() - start_time) * 1000),
+        )
+
+
+async def awarm_llm_clients(
+    context: Union[RuntimeContext, Dict[str, Any]],
+    model_tiers: Tuple[str, ...] = ("small", "medium", "large"),
+) -> None:
+    """
+    Async counterpart of warm_llm_clients for the AsyncOpenAI pools.
+
+    The chat path streams through the async clients, which keep their own
+    connection pools, so they need warming separately. Tiers are warmed
+    concurrently; failures are logged and ignored.
+
+    Args:
+        context: RuntimeContext, or a dict containing execution_id,
+                 auth_config and ssl_config.
+        model_tiers: Tiers to warm.
+    """
+    logger = get_logger()
+    context = _runtime_context(context)
+
+    async def warm_tier(model_tier: str) -> None:
+        start_time = time.perf_counter()
+        try:
+            await _get_async_llm_client(context, model_tier).models.list(timeout=2.0)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Warm-up is best effort; the first real call will surface real errors.
+            logger.warning(
+                "Async LLM client warm-up failed",
+                execution_id=context.execution_id,
+                model_tier=model_tier,
+                error=str(e),
+            )
+            return
+        logger.debug(
+            "Async LLM client warmed",
+            execution_id=context.execution_id,
+            model_tier=model_tier,
+            elapsed_ms=int((time.perf_counter() - start_time) * 1000),
+        )
+
+    await asyncio.gather(*(warm_tier(model_tier) for model_tier in model_tiers))
+
+
+def check_connection(context: Union[RuntimeContext, Dict[str, Any]]) -> Dict[str, Any]:
     """
     Check the LLM connection with a simple prompt.
 
@@ -909,7 +1735,7 @@ def check_connection(context: Dict[str, Any]) -> Dict[str, Any]:
     connectivity are working properly.
 
     Args:
-        context: Runtime context containing:
+        context: RuntimeContext, or a dict containing:
                  - execution_id: Unique identifier for this execution
                  - auth_config: Authentication configuration
                  - ssl_config: SSL configuration
@@ -925,11 +1751,12 @@ def check_connection(context: Dict[str, Any]) -> Dict[str, Any]:
         # }
     """
     logger = get_logger()
+    context = _runtime_context(context)
 
     logger.info(
         "Testing LLM connection",
-        execution_id=context["execution_id"],
-        auth_method=context["auth_config"].get("method"),
+        execution_id=context.execution_id,
+        auth_method=context.auth_method,
         base_url=config.llm.base_url,
     )
 
@@ -956,13 +1783,13 @@ def check_connection(context: Dict[str, Any]) -> Dict[str, Any]:
             "status": "success",
             "model": config.llm.small.model,
             "response": content,
-            "auth_method": context["auth_config"].get("method"),
+            "auth_method": context.auth_method,
             "base_url": config.llm.base_url,
         }
 
         logger.info(
             "LLM connection test successful",
-            execution_id=context["execution_id"],
+            execution_id=context.execution_id,
             response=content,
         )
 
@@ -973,13 +1800,13 @@ def check_connection(context: Dict[str, Any]) -> Dict[str, Any]:
         result = {
             "status": "failed",
             "error": str(e),
-            "auth_method": context["auth_config"].get("method"),
+            "auth_method": context.auth_method,
             "base_url": config.llm.base_url,
         }
 
         logger.error(
             "LLM connection test failed",
-            execution_id=context["execution_id"],
+            execution_id=context.execution_id,
             error=str(e),
         )
 
@@ -5,8 +5,12 @@ This module handles OAuth token generation using client credentials flow
 with retry logic, SSL support, and comprehensive error handling.
 """
 
-from typing import Any, Dict, Optional
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
+import orjson
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -14,14 +18,33 @@ from urllib3.util.retry import Retry
 from ..utils.logging import get_logger
 from ..utils.settings import config
 
+# Seconds before expiry at which a cached token is treated as stale (capped at
+# half the lifetime so short-lived tokens are still reused)
+TOKEN_EXPIRY_MARGIN = 300
+
+# Token responses and their monotonic refresh time, keyed by _token_cache_key()
+_token_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+_token_lock = threading.Lock()
+
+# Shared HTTP session so the connection to the token endpoint stays warm
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _token_cache_key() -> str:
+    """Hash the OAuth endpoint, client and grant type so no credentials sit in the key."""
+    identity = f"{config.oauth_endpoint}|{config.oauth_client_id}|{config.oauth_grant_type}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
 
 def get_oauth_token(execution_id: str, ssl_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Internal function to retrieve OAuth access token using client credentials flow.
 
-    Uses HTTP Basic Authentication to securely send credentials in the
-    Authorization header rather than in the request body. Includes retry
-    logic with exponential backoff for resilience.
+    Tokens are cached in-process per endpoint and client until shortly
+    before their expires_in lifetime ends (3600s if the server omits it),
+    so only the first call (and one per token lifetime) pays the network
+    round trip. The lock ensures concurrent callers trigger a single refresh.
 
     NOTE: This is an internal function. Use get_authentication() instead.
 
@@ -49,14 +72,63 @@ def get_oauth_token(execution_id: str, ssl_config: Dict[str, Any]) -> Optional[D
         logger.debug("OAuth not configured, skipping token generation", execution_id=execution_id)
         return None
 
+    cache_key = _token_cache_key()
+
+    # Lock-free fast path: dict reads are atomic, so concurrent chats holding a
+    # valid token never queue behind the lock
+    cached = _token_cache.get(cache_key)
+    if cached is not None and time.monotonic() < cached[1]:
+        logger.debug("Using cached OAuth token", execution_id=execution_id)
+        return cached[0]
+
+    with _token_lock:
+        # Another thread may have refreshed the token while we waited
+        cached = _token_cache.get(cache_key)
+        if cached is not None and time.monotonic() < cached[1]:
+            logger.debug("Using cached OAuth token", execution_id=execution_id)
+            return cached[0]
+
+        token_data = _request_oauth_token(execution_id, ssl_config)
+
+        try:
+            expires_in = float(token_data.get("expires_in", 3600))
+        except (TypeError, ValueError):
+            expires_in = 0
+        if expires_in > 0:
+            margin = min(TOKEN_EXPIRY_MARGIN, expires_in / 2)
+            _token_cache[cache_key] = (token_data, time.monotonic() + expires_in - margin)
+
+        return token_data
+
+
+def _request_oauth_token(execution_id: str, ssl_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Request a new OAuth access token from the token endpoint.
+
+    Uses HTTP Basic Authentication to securely send credentials in the
+    Authorization header rather than in the request body. Includes retry
+    logic with exponential backoff for resilience.
+
+    Args:
+        execution_id: Unique identifier for this execution for logging.
+        ssl_config: SSL configuration from workflow setup.
+
+    Returns:
+        OAuth token response containing access token and metadata.
+
+    Raises:
+        requests.RequestException: If token generation fails after retries.
+    """
+    logger = get_logger()
+
     logger.info(
         "Initiating OAuth token generation",
         execution_id=execution_id,
         endpoint=config.oauth_endpoint,
     )
 
-    # Configure session with retry strategy
-    session = _create_session_with_retry()
+    # Shared session with retry strategy and a persistent connection pool
+    session = _get_session()
 
     try:
         # Determine SSL verification setting
@@ -77,8 +149,8 @@ def get_oauth_token(execution_id: str, ssl_config: Dict[str, Any]) -> Optional[D
         # Check for HTTP errors
         response.raise_for_status()
 
-        # Parse token response
-        token_data = response.json()
+        # Parse token response (orjson.JSONDecodeError is a ValueError)
+        token_data = orjson.loads(response.content)
 
         # Validate response contains required fields
         if "access_token" not in token_data:
@@ -129,8 +201,23 @@ def get_oauth_token(execution_id: str, ssl_config: Dict[str, Any]) -> Optional[D
         )
         raise
 
-    finally:
-        session.close()
+
+def _get_session() -> requests.Session:
+    """
+    Return the shared OAuth session, creating it on first use.
+
+    Reusing one session keeps urllib3's pooled connection (and its TLS
+    session) to the token endpoint alive between token refreshes.
+
+    Returns:
+        Shared requests.Session with retry adapter.
+    """
+    global _session  # pylint: disable=global-statement
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session_with_retry()
+    return _session
 
 
 def _create_session_with_retry() -> requests.Session:
@@ -155,7 +242,7 @@ def _create_session_with_retry() -> requests.Session:
     )
 
     # Mount retry adapter to session
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=10, pool_maxsize=10)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
@@ -236,9 +323,9 @@ def setup_authentication(execution_id: str, ssl_config: Dict[str, Any]) -> Dict[
             "decision_details": f"Authentication failed: {error_msg}",
         }
 
-    except Exception as e:  # pylint: disable=broad-exception-caught
-        # Must catch all exceptions to ensure auth failures don't crash the workflow.
-        # Returns error details for logging while allowing the system to continue.
+    except (KeyError, ValueError, requests.exceptions.RequestException) as e:
+        # Token endpoint and response problems are reported as a failed setup so
+        # the workflow can continue; anything else is a bug and propagates.
         error_msg = f"Unexpected error during authentication: {str(e)}"
         logger.error(error_msg, execution_id=execution_id)
         return {
@@ -314,17 +401,6 @@ def _handle_oauth_auth(execution_id: str, ssl_config: Dict[str, Any], logger) ->
             "header": {},
             "error": error_msg,
         }
-    except Exception as e:
-        logger.warning(
-            "Failed to obtain OAuth token - using placeholder",
-            execution_id=execution_id,
-            error=str(e),
-        )
-        return {
-            "method": "placeholder",
-            "token": "oauth-failed",
-            "header": {"Authorization": "Bearer oauth-failed"},
-        }
 
 
 def _handle_api_key_auth(execution_id: str, logger) -> Dict[str, Any]:
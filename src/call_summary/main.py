@@ -5,58 +5,26 @@ A conversational AI chatbot with document upload capabilities.
 Supports Word (.docx) and PDF files for context-aware conversations.
 """
 
+import asyncio
 import uuid
-from typing import Dict, List, Any, Generator, Optional
+from typing import Dict, List, Any, AsyncGenerator, Optional, Tuple
+from openai import OpenAIError
 from src.call_summary.utils.logging import get_logger
 from src.call_summary.utils.settings import config
 from src.call_summary.utils.ssl import setup_ssl
 from src.call_summary.connections.oauth_connector import setup_authentication
-from src.call_summary.connections.llm_connector import stream as llm_stream
+from src.call_summary.connections.llm_connector import (
+    RuntimeContext,
+    astream as llm_stream,
+    awarm_llm_clients,
+    warm_llm_clients,
+)
 # Prompts removed - using inline basic prompt
 
 logger = get_logger()
 
-
-def chat_with_documents(
-    messages: List[Dict[str, str]], 
-    documents: Optional[List[str]] = None,
-    model_size: str = 'large',
-    prompt_mode: str = 'text'
-) -> Generator[Dict[str, str], None, None]:
-    """
-    Stream chat responses with optional document context.
-    
-    Args:
-        messages: Conversation history from the user
-        documents: Optional list of document contents to include in context
-        prompt_mode: Either 'text' for markdown formatting or 'voice' for spoken style
-        
-    Yields:
-        Response chunks with streaming text
-    """
-    execution_id = str(uuid.uuid4())
-    logger.info(f"Starting chat session {execution_id} with prompt_mode: {prompt_mode}")
-    
-    try:
-        # Setup SSL first
-        ssl_config = setup_ssl()
-        
-        # Setup authentication with execution_id and ssl_config
-        auth_config = setup_authentication(execution_id, ssl_config)
-        
-        context = {
-            "execution_id": execution_id,
-            "auth_config": auth_config,
-            "ssl_config": ssl_config
-        }
-        
-        # Build conversation with system prompt
-        enhanced_messages = []
-        
-        # Choose prompt based on mode
-        if prompt_mode == 'voice':
-            # Voice mode prompt - optimized for natural speech
-            system_prompt = """You are having a natural conversation with the user. Your responses will be converted to speech and played as audio.
+# Voice mode prompt - optimized for natural speech
+VOICE_SYSTEM_PROMPT = """You are having a natural conversation with the user. Your responses will be converted to speech and played as audio.
 
 Guidelines for spoken responses:
 - Use natural, conversational language as if speaking face-to-face
@@ -70,9 +38,9 @@ Guidelines for spoken responses:
 When referencing documents, describe them naturally: "Looking at your document, I can see that..." or "The file you shared mentions..."
 
 Focus on clarity and natural speech patterns that sound engaging when heard aloud."""
-        else:
-            # Text mode prompt - simplified to avoid confusing the model
-            system_prompt = """You are a helpful AI assistant. When documents are provided, you can analyze them to answer questions and provide insights.
+
+# Text mode prompt - simplified to avoid confusing the model
+TEXT_SYSTEM_PROMPT = """You are a helpful AI assistant. When documents are provided, you can analyze them to answer questions and provide insights.
 
 When responding:
 - Be clear and concise
@@ -81,70 +49,204 @@ When responding:
 - Structure your response logically: introduction, content, conclusion
 
 Focus on providing accurate and helpful information."""
+
+# System messages are shared across requests; the LLM client only reads them
+VOICE_SYSTEM_MESSAGE = {"role": "system", "content": VOICE_SYSTEM_PROMPT}
+TEXT_SYSTEM_MESSAGE = {"role": "system", "content": TEXT_SYSTEM_PROMPT}
+SYSTEM_MESSAGES = {"voice": VOICE_SYSTEM_MESSAGE, "text": TEXT_SYSTEM_MESSAGE}
+
+# Opening of the document section of the system message; documents are
+# appended to it in the same join so the (possibly large) context is copied
+# only once
+DOCUMENTS_HEADER = (
+    "The user has uploaded the following documents for reference:\n"
+    "\n\n===== UPLOADED DOCUMENTS =====\n\n"
+)
+DOCUMENT_SEPARATOR = "=" * 50 + "\n\n"
+
+# Header for documents uploaded with metadata; parsed once at import and
+# filled with format_map. Content is appended separately so large bodies
+# are not copied into the formatted string.
+DOCUMENT_HEADER_TEMPLATE = (
+    "===== DOCUMENT {i} =====\n"
+    "[FILE METADATA]\n"
+    "  • Filename: {original_filename}\n"
+    "  • File Type: {file_extension}\n"
+    "  • File Size: {file_size_human}\n"
+    "  • Upload Time: {upload_timestamp}\n"
+    "  • Last Modified: {last_modified}\n"
+    "  • Document ID: {id}\n"
+    "\n[FILE CONTENT]\n"
+)
+
+
+# Metadata keys DOCUMENT_HEADER_TEMPLATE renders, all part of the cache key
+DOCUMENT_HEADER_METADATA_KEYS = (
+    'original_filename', 'file_extension', 'file_size_human', 'upload_timestamp', 'last_modified',
+)
+
+# Rendered metadata headers keyed by position, document id, filename and the
+# rendered metadata values; only read and written on the event loop thread
+DOCUMENT_HEADER_CACHE_SIZE = 512
+_document_header_cache: Dict[Tuple[Any, ...], str] = {}
+
+
+class _MetadataFields(dict):
+    """Template fields that fall back to 'Unknown' when metadata lacks a key."""
+
+    def __missing__(self, key: str) -> str:
+        return 'Unknown'
+
+
+def _format_text_doc(i: int, doc: str, parts: List[str]) -> None:
+    """Append a legacy document (just a content string)."""
+    parts.append(f"Document {i}:\n{doc}\n\n")
+    parts.append(DOCUMENT_SEPARATOR)
+
+
+def _render_document_header(i: int, doc: Dict[str, Any]) -> str:
+    """Fill DOCUMENT_HEADER_TEMPLATE for a document dict."""
+    metadata = doc.get('metadata', {})
+    return DOCUMENT_HEADER_TEMPLATE.format_map(_MetadataFields(
+        metadata,
+        i=i,
+        id=doc.get('id', 'Unknown'),
+        original_filename=metadata.get('original_filename', doc.get('filename', 'Unknown')),
+        file_extension=metadata.get('file_extension', 'Unknown').upper(),
+    ))
+
+
+def _format_metadata_doc(i: int, doc: Dict[str, Any], parts: List[str]) -> None:
+    """Append a document dict with a structured metadata header."""
+    doc_id = doc.get('id')
+    if doc_id is None:
+        parts.append(_render_document_header(i, doc))
+    else:
+        # Uploads keep their id and metadata, so a session re-sending the same
+        # documents reuses the headers rendered on its previous turn. Every
+        # rendered field is in the key, so changed metadata renders afresh.
+        metadata = doc.get('metadata', {})
+        key = (
+            i,
+            doc_id,
+            doc.get('filename'),
+            *(metadata.get(name) for name in DOCUMENT_HEADER_METADATA_KEYS),
+        )
+        header = _document_header_cache.get(key)
+        if header is None:
+            header = _render_document_header(i, doc)
+            if len(_document_header_cache) >= DOCUMENT_HEADER_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del _document_header_cache[next(iter(_document_header_cache))]
+            _document_header_cache[key] = header
+        parts.append(header)
+    parts.append(doc.get('content', ''))
+    parts.append("\n\n")
+    parts.append(DOCUMENT_SEPARATOR)
+
+
+# Old format (string) and new format (dict with metadata)
+_DOC_FORMATTERS = {str: _format_text_doc, dict: _format_metadata_doc}
+
+
+def build_messages(
+    messages: List[Dict[str, str]],
+    documents: Optional[List[Any]] = None,
+    prompt_mode: str = 'text'
+) -> List[Dict[str, str]]:
+    """
+    Prepend the system prompt and any document context to a conversation.
+    
+    Args:
+        messages: Conversation history from the user
+        documents: Optional list of documents (content strings or dicts with metadata)
+        prompt_mode: Either 'text' for markdown formatting or 'voice' for spoken style
         
-        enhanced_messages.append({
-            "role": "system",
-            "content": system_prompt
-        })
-        
-        # Add document content if provided
-        if documents:
-            document_context = "\n\n===== UPLOADED DOCUMENTS =====\n\n"
-            for i, doc in enumerate(documents, 1):
-                # Handle both old format (string) and new format (dict with metadata)
-                if isinstance(doc, str):
-                    # Legacy format - just content string
-                    document_context += f"Document {i}:\n{doc}\n\n"
-                    document_context += "=" * 50 + "\n\n"
-                elif isinstance(doc, dict):
-                    # New format with metadata
-                    metadata = doc.get('metadata', {})
-                    content = doc.get('content', '')
-                    
-                    # Create structured document header with metadata
-                    document_context += f"===== DOCUMENT {i} =====\n"
-                    document_context += f"[FILE METADATA]\n"
-                    document_context += f"  • Filename: {metadata.get('original_filename', doc.get('filename', 'Unknown'))}\n"
-                    document_context += f"  • File Type: {metadata.get('file_extension', 'Unknown').upper()}\n"
-                    document_context += f"  • File Size: {metadata.get('file_size_human', 'Unknown')}\n"
-                    document_context += f"  • Upload Time: {metadata.get('upload_timestamp', 'Unknown')}\n"
-                    document_context += f"  • Last Modified: {metadata.get('last_modified', 'Unknown')}\n"
-                    document_context += f"  • Document ID: {doc.get('id', 'Unknown')}\n"
-                    document_context += f"\n[FILE CONTENT]\n"
-                    document_context += f"{content}\n\n"
-                    document_context += "=" * 50 + "\n\n"
-            
-            enhanced_messages.append({
-                "role": "system",
-                "content": f"The user has uploaded the following documents for reference:\n{document_context}"
-            })
-            
-            logger.info(f"Added {len(documents)} documents to context")
-        
-        # Add the conversation messages
-        enhanced_messages.extend(messages)
-        
-        # Stream response from LLM
-        logger.info(f"Sending request to LLM with {len(enhanced_messages)} messages using model: {model_size}")
+    Returns:
+        Message list ready to send to the LLM
+    """
+    # Choose prompt based on mode; unknown modes (e.g. 'basic') get the text prompt
+    system_message = SYSTEM_MESSAGES.get(prompt_mode, TEXT_SYSTEM_MESSAGE)
+    
+    # Without documents the list is built in one step
+    if not documents:
+        return [system_message, *messages]
+    
+    # Documents follow the prompt in the same system message, so the prompt stays
+    # a stable prefix. Pieces are joined once; += would recopy every document.
+    parts = [system_message["content"], "\n\n", DOCUMENTS_HEADER]
+    for i, doc in enumerate(documents, 1):
+        # Documents come from JSON, so an exact type lookup picks the formatter;
+        # anything else is skipped as before
+        formatter = _DOC_FORMATTERS.get(type(doc))
+        if formatter is not None:
+            formatter(i, doc, parts)
+    
+    logger.info("Added documents to context", document_count=len(documents))
+    
+    # One system message with prompt and documents, then the conversation messages
+    return [{"role": "system", "content": "".join(parts)}, *messages]
+
+
+async def chat_with_documents(
+    messages: List[Dict[str, str]], 
+    documents: Optional[List[str]] = None,
+    model_size: str = 'large',
+    prompt_mode: str = 'text'
+) -> AsyncGenerator[Dict[str, str], None]:
+    """
+    Stream chat responses with optional document context.
+
+    Runs on the caller's event loop: the LLM stream is read on the async
+    client, and only the (usually cached) authentication step is handed
+    to a worker thread.
+    
+    Args:
+        messages: Conversation history from the user
+        documents: Optional list of document contents to include in context
+        prompt_mode: Either 'text' for markdown formatting or 'voice' for spoken style
         
-        for chunk in llm_stream(enhanced_messages, context, model_size=model_size):
-            # Handle different chunk types
-            if chunk.get("type") == "usage_stats":
+    Yields:
+        Response chunks with streaming text
+    """
+    execution_id = uuid.uuid4().hex
+    logger.info("Starting chat session", execution_id=execution_id, prompt_mode=prompt_mode)
+    
+    # Setup SSL first
+    ssl_config = setup_ssl()
+    
+    # Setup authentication with execution_id and ssl_config
+    auth_config = await asyncio.to_thread(setup_authentication, execution_id, ssl_config)
+    
+    context = RuntimeContext.from_workflow(execution_id, auth_config, ssl_config)
+    
+    enhanced_messages = build_messages(messages, documents, prompt_mode)
+    
+    # Stream response from LLM
+    logger.info(
+        "Sending request to LLM",
+        execution_id=execution_id,
+        message_count=len(enhanced_messages),
+        model=model_size,
+    )
+    
+    try:
+        async for chunk in llm_stream(enhanced_messages, context, model_size=model_size):
+            # Handle different chunk types; content deltas are nearly every chunk,
+            # so they are checked first with a single lookup
+            choices = chunk.get("choices")
+            if choices:
+                # Extract text content from chunk
+                content = choices[0]["delta"].get("content")
+                if content:
+                    yield {"type": "assistant", "content": content}
+            elif chunk.get("type") == "usage_stats":
                 # Pass through usage statistics
                 yield {
                     "type": "usage",
                     "usage": chunk.get("usage", {}),
                     "metrics": chunk.get("metrics", {})
                 }
-            elif chunk.get("choices") and len(chunk["choices"]) > 0:
-                # Extract text content from chunk
-                delta = chunk["choices"][0].get("delta", {})
-                content = delta.get("content", "")
-                if content:
-                    yield {
-                        "type": "assistant",
-                        "content": content
-                    }
             elif chunk.get("usage"):
                 # Handle usage in regular chunks (fallback)
                 yield {
@@ -152,15 +254,17 @@ Focus on providing accurate and helpful information."""
                     "usage": chunk["usage"]
                 }
             
-    except Exception as e:
-        logger.error(f"Error in chat: {e}")
+    except OpenAIError as e:
+        # API and connection failures end the stream with a message the UI can show;
+        # anything else is a bug and propagates to model()
+        logger.error("Error in chat", execution_id=execution_id, error=str(e))
         yield {
             "type": "error",
             "content": f"An error occurred: {str(e)}"
         }
 
 
-def model(conversation: Dict[str, Any]) -> Generator[Dict[str, str], None, None]:
+async def model(conversation: Dict[str, Any]) -> AsyncGenerator[Dict[str, str], None]:
     """
     Main entry point that mimics Aegis model interface.
     
@@ -175,5 +279,110 @@ def model(conversation: Dict[str, Any]) -> Generator[Dict[str, str], None, None]
     model_size = conversation.get("model", "large")
     prompt_mode = conversation.get("prompt_mode", "basic")
     
-    for chunk in chat_with_documents(messages, documents, model_size, prompt_mode):
-        yield chunk
\ No newline at end of file
+    try:
+        async for chunk in chat_with_documents(messages, documents, model_size, prompt_mode):
+            yield chunk
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        # Last resort so the client still receives an error event
+        logger.error("Unexpected error in chat", error=str(e), exc_info=True)
+        yield {
+            "type": "error",
+            "content": f"An error occurred: {str(e)}"
+        }
+
+
+async def _collect_response(
+    messages: List[Dict[str, str]],
+    context: RuntimeContext,
+    model_size: str
+) -> Dict[str, Any]:
+    """Read one LLM stream to the end and return its text with usage and metrics."""
+    parts = []
+    result: Dict[str, Any] = {"usage": None, "metrics": None}
+    async for chunk in llm_stream(messages, context, model_size=model_size):
+        choices = chunk.get("choices")
+        if choices:
+            content = choices[0]["delta"].get("content")
+            if content:
+                parts.append(content)
+        elif chunk.get("type") == "usage_stats":
+            result["usage"] = chunk.get("usage", {})
+            result["metrics"] = chunk.get("metrics", {})
+    result["content"] = "".join(parts)
+    return result
+
+
+async def model_batch(conversations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run several independent conversations concurrently, e.g. a summary,
+    title and tags for the same upload.
+    
+    SSL and authentication are set up once for the whole batch; the LLM
+    calls then run in parallel on the async client. This is concurrent
+    dispatch, one request per conversation, not a single batched request.
+    
+    Args:
+        conversations: Dictionaries in the same shape model() accepts
+        
+    Returns:
+        One dict per conversation, in order: 'content', 'usage' and 'metrics',
+        or 'error' if that conversation's LLM call failed
+    """
+    execution_id = uuid.uuid4().hex
+    logger.info("Starting batch", execution_id=execution_id, conversation_count=len(conversations))
+    
+    ssl_config = setup_ssl()
+    auth_config = await asyncio.to_thread(setup_authentication, execution_id, ssl_config)
+    context = RuntimeContext.from_workflow(execution_id, auth_config, ssl_config)
+    
+    results = await asyncio.gather(
+        *(
+            _collect_response(
+                build_messages(
+                    conversation.get("messages", []),
+                    conversation.get("documents"),
+                    conversation.get("prompt_mode", "basic"),
+                ),
+                context,
+                conversation.get("model", "large"),
+            )
+            for conversation in conversations
+        ),
+        return_exceptions=True,
+    )
+    
+    responses = []
+    for result in results:
+        if isinstance(result, OpenAIError):
+            logger.error("Error in batch", execution_id=execution_id, error=str(result))
+            responses.append({"error": f"An error occurred: {str(result)}"})
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            responses.append(result)
+    return responses
+
+
+async def warm_up() -> None:
+    """
+    Authenticate and open LLM connections before the first chat request.
+    
+    Intended to run as a background task at server startup so the first
+    user request does not pay for the token fetch and TLS handshakes. Both
+    the async pools used by chat and the sync pools used by the blocking
+    helpers are warmed.
+    """
+    execution_id = uuid.uuid4().hex
+    try:
+        ssl_config = setup_ssl()
+        auth_config = await asyncio.to_thread(setup_authentication, execution_id, ssl_config)
+        if not auth_config.get("success"):
+            logger.warning("Skipping LLM warm-up", error=auth_config.get("error"))
+            return
+        context = RuntimeContext.from_workflow(execution_id, auth_config, ssl_config)
+        await asyncio.gather(
+            awarm_llm_clients(context),
+            asyncio.to_thread(warm_llm_clients, context),
+        )
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("LLM warm-up failed", error=str(e))
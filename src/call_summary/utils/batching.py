@@ -0,0 +1,106 @@
+"""
+Request micro-batching module.
+
+This module coalesces concurrent requests for a blocking model call so
+that requests arriving within a short window share one worker-thread
+dispatch instead of each paying the fixed per-call overhead.
+"""
+
+import asyncio
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class MicroBatcher:
+    """
+    Collect concurrent requests and hand them to a blocking batch function.
+
+    The first request of a batch waits at most ``max_wait_ms`` for others
+    to arrive; the batch is dispatched early once ``max_batch_size`` items
+    are queued, so a busy server batches more and an idle one adds at most
+    the wait window of latency.
+
+    The batch function runs in a worker thread, receives the list of items
+    and must return one result per item, in order. A result that is an
+    Exception instance is raised to that item's caller only.
+
+    A single worker drains the queue, so the model sees one batch at a time.
+    With ``max_queue_size`` set, submitters wait for space once that many
+    items are pending instead of piling up unbounded work.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10,
+        max_queue_size: int = 0,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            process_batch: Blocking function mapping a list of items to results.
+            max_batch_size: Largest number of items dispatched together.
+            max_wait_ms: How long the first item waits for companions.
+            max_queue_size: Pending items allowed before submit() waits (0 = unbounded).
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item and wait for its result.
+
+        Args:
+            item: Argument passed to the batch function for this request.
+
+        Returns:
+            The batch function's result for this item.
+        """
+        if self._worker is None or self._worker.done():
+            # Bound to the running loop, so created on first use rather than at import
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Wait for one item, then gather companions until full or the window closes."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        """Dispatch batches until the event loop shuts down."""
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+
+            try:
+                results = await asyncio.to_thread(self.process_batch, items)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                results = [e] * len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue  # Caller went away
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
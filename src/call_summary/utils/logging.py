@@ -5,14 +5,40 @@ This module provides structured logging setup with colored console output
 and configurable log levels from environment variables.
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Dict, Optional
 
 import structlog
 
 from .settings import config
 
+# Background thread that writes queued log records to stdout
+_log_listener: Optional[QueueListener] = None
+
+
+# ANSI codes
+_RESET = "\033[0m"
+_DIM = "\033[2m"
+_BOLD = "\033[1m"
+
+# Level styling with icons and colors, rendered once into ready-made prefixes
+_LEVEL_PREFIXES = {
+    level: f"{color}{_BOLD}{icon} {level}{_RESET}"
+    for level, (icon, color) in {
+        "DEBUG": ("🔍", "\033[36m"),  # Cyan with magnifying glass
+        "INFO": ("✓", "\033[32m"),  # Green with checkmark
+        "WARNING": ("⚠", "\033[33m"),  # Yellow with warning sign
+        "ERROR": ("✗", "\033[31m"),  # Red with X
+        "CRITICAL": ("🔥", "\033[35m"),  # Magenta with fire
+    }.items()
+}
+_CONTEXT_SEPARATOR = f" {_DIM}│{_RESET} "
+_KEY_SUFFIX = f"={_RESET}"
+
 
 def custom_renderer(_, __, event_dict: Dict[str, Any]) -> str:
     """
@@ -34,36 +60,18 @@ def custom_renderer(_, __, event_dict: Dict[str, Any]) -> str:
     level = event_dict.pop("level", "").upper()
     event = event_dict.pop("event", "")
 
-    # Level styling with icons and colors
-    level_styles = {
-        "DEBUG": ("🔍", "\033[36m"),  # Cyan with magnifying glass
-        "INFO": ("✓", "\033[32m"),  # Green with checkmark
-        "WARNING": ("⚠", "\033[33m"),  # Yellow with warning sign
-        "ERROR": ("✗", "\033[31m"),  # Red with X
-        "CRITICAL": ("🔥", "\033[35m"),  # Magenta with fire
-    }
-
-    # ANSI codes
-    reset = "\033[0m"
-    dim = "\033[2m"
-    bold = "\033[1m"
-
-    # Get style for level
-    icon, color = level_styles.get(level, ("•", ""))
-
-    # Format timestamp with dim style
-    time_str = f"{dim}{timestamp}{reset}"
-
-    # Format level with icon
-    level_str = f"{color}{bold}{icon} {level}{reset}"
+    prefix = _LEVEL_PREFIXES.get(level)
+    if prefix is None:
+        prefix = f"{_BOLD}• {level}{_RESET}"
 
     # Build output with arrow separator
-    output = f"{time_str} {level_str} ▸ {event}"
+    output = f"{_DIM}{timestamp}{_RESET} {prefix} ▸ {event}"
 
     # Add context if any
     if event_dict:
-        context = " ".join([f"{dim}{k}={reset}{v}" for k, v in event_dict.items()])
-        output += f" {dim}│{reset} " + context
+        output += _CONTEXT_SEPARATOR + " ".join(
+            f"{_DIM}{k}{_KEY_SUFFIX}{v}" for k, v in event_dict.items()
+        )
 
     return output
 
@@ -77,31 +85,83 @@ def setup_logging(log_level: Optional[str] = None) -> None:
     - Timestamp formatting (YYYY-MM-DD HH:MM:SS)
     - Contextual key-value pair display
     - Log level from environment (LOG_LEVEL) or parameter
+    - Records handed to a QueueHandler and written by a background
+      QueueListener, so callers never block on console I/O
 
     Args:
         log_level: Log level override. If None, uses LOG_LEVEL from environment
                   (default: INFO). Valid: DEBUG, INFO, WARNING, ERROR, CRITICAL
     """
+    global _log_listener  # pylint: disable=global-statement
+
     # Use environment variable if log_level not specified
     if log_level is None:
         log_level = config.log_level
+    level = getattr(logging, log_level.upper())
+
+    # Configure Python's logging: the root logger only enqueues records and the
+    # listener thread does the writing. Stopped at exit to flush what is queued.
+    if _log_listener is None:
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        # QueueHandler formats the record before enqueueing it
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter("%(message)s"))
+        _log_listener = QueueListener(
+            log_queue, logging.StreamHandler(sys.stdout), respect_handler_level=True
+        )
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+        logging.basicConfig(level=level, handlers=[queue_handler])
+    logging.getLogger().setLevel(level)
+
+    # Render through the standard library logger so output shares the queue above
+    _configure_structlog(level)
+
+
+def setup_worker_logging(log_level: Optional[str] = None) -> None:
+    """
+    Configure logging in a worker process, e.g. as a ProcessPoolExecutor initializer.
 
-    # Configure Python's logging
-    logging.basicConfig(
-        format="%(message)s", stream=sys.stdout, level=getattr(logging, log_level.upper())
-    )
+    Forked workers inherit the parent's QueueHandler but not its listener
+    thread, so records queued there would never be written (and a queue
+    lock held at fork time could block the worker). Workers instead write
+    straight to stdout with the same formatting.
+
+    Args:
+        log_level: Log level override. If None, uses LOG_LEVEL from environment.
+    """
+    if log_level is None:
+        log_level = config.log_level
+    level = getattr(logging, log_level.upper())
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=level, handlers=[handler], force=True)
 
-    # Configure structlog
+    _configure_structlog(level)
+
+
+def _configure_structlog(level: int) -> None:
+    """
+    Configure structlog to render to a string and emit through the standard library logger.
+
+    The filtering bound logger drops records below the level before any
+    processor runs; for records that pass, cheap processors go first and
+    the timestamp (strftime) last before rendering.
+
+    Args:
+        level: Numeric logging level.
+    """
     structlog.configure(
         processors=[
-            structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
+            structlog.contextvars.merge_contextvars,
             structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S"),
             custom_renderer,
         ],
-        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, log_level.upper())),
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
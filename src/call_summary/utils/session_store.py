@@ -0,0 +1,302 @@
+"""
+Session storage module.
+
+This module keeps per-user chat sessions outside of request handlers so
+that memory stays bounded and several worker processes can share state.
+Sessions live in Redis when REDIS_URL is configured, otherwise in an
+in-process store with the same expiry semantics for local development.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+from .logging import get_logger
+from .settings import config
+
+
+class SessionStore:
+    """
+    Dict-style store for session records with a sliding TTL.
+
+    Session records hold conversation state and document metadata only.
+    Document contents are kept under separate keys so that metadata reads
+    (e.g. status polling) never deserialize large document bodies.
+
+    Records are serialized on every write, so callers must assign a
+    modified record back (``store[session_id] = record``) to persist it.
+
+    Like ``collections.defaultdict``, a store with a ``default_factory``
+    creates and persists a fresh record when a missing session is read.
+
+    The in-process store is an LRU capped at ``max_entries`` keys (session
+    records, document contents and cached extractions together). Redis
+    relies on TTL expiry and its own eviction policy instead.
+
+    Request handlers use the ``a``-prefixed coroutines (``aget``, ``aset``,
+    ...), which move Redis round trips off the event loop.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "",
+        ttl: int = 3600,
+        default_factory: Optional[Callable[[], Dict[str, Any]]] = None,
+        max_entries: int = 4096,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            redis_url: Redis connection URL. Empty uses the in-process store.
+            ttl: Seconds a session (and its documents) live after last use.
+            default_factory: Builds the record for sessions read before creation.
+            max_entries: Key cap for the in-process store.
+        """
+        self.ttl = ttl
+        self.default_factory = default_factory
+        self.max_entries = max_entries
+        self._redis = None
+        # Ordered oldest-access first; with a sliding TTL that is also expiry order
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if redis_url:
+            import redis  # pylint: disable=import-outside-toplevel
+
+            self._redis = redis.Redis.from_url(redis_url)
+
+    @staticmethod
+    def _session_key(session_id: str) -> str:
+        """Build the key for a session record."""
+        return f"sess:{session_id}"
+
+    @staticmethod
+    def _document_key(session_id: str, doc_id: str) -> str:
+        """Build the key for a single document's content."""
+        return f"sess:{session_id}:doc:{doc_id}"
+
+    # Low-level key/value operations
+
+    def _get(self, key: str) -> Optional[str]:
+        """Fetch a value and slide its expiry."""
+        if self._redis is not None:
+            value = self._redis.getex(key, ex=self.ttl)
+            return value.decode("utf-8") if value is not None else None
+
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._local[key]
+                return None
+            self._local[key] = (time.monotonic() + self.ttl, entry[1])
+            self._local.move_to_end(key)
+            return entry[1]
+
+    def _mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Fetch several values in one round trip."""
+        if self._redis is not None:
+            if not keys:
+                return []
+            return [v.decode("utf-8") if v is not None else None for v in self._redis.mget(keys)]
+        return [self._get(key) for key in keys]
+
+    def _set(self, key: str, value: str, touch: Iterable[str] = ()) -> None:
+        """Store a value and refresh the expiry of related keys."""
+        if self._redis is not None:
+            pipe = self._redis.pipeline()
+            pipe.setex(key, self.ttl, value)
+            for related in touch:
+                pipe.expire(related, self.ttl)
+            pipe.execute()
+            return
+
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl
+            self._local[key] = (expires_at, value)
+            self._local.move_to_end(key)
+            for related in touch:
+                if related in self._local:
+                    self._local[related] = (expires_at, self._local[related][1])
+                    self._local.move_to_end(related)
+            self._evict()
+
+    def _delete(self, *keys: str) -> None:
+        """Remove keys if present."""
+        if not keys:
+            return
+        if self._redis is not None:
+            self._redis.delete(*keys)
+            return
+
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+    def _evict(self) -> None:
+        """Drop expired and least recently used in-process entries. Caller must hold the lock."""
+        # Every access slides the expiry and moves the key to the end, so expired
+        # entries are always at the front and the scan stops at the first live one
+        now = time.monotonic()
+        while self._local and next(iter(self._local.values()))[0] < now:
+            self._local.popitem(last=False)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    # Session records
+
+    def __contains__(self, session_id: str) -> bool:
+        """Check whether a live session record exists."""
+        return self._get(self._session_key(session_id)) is not None
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        """
+        Load a session record, creating it if a default_factory is set.
+
+        Raises:
+            KeyError: If the session does not exist or has expired and the
+                store has no default_factory.
+        """
+        value = self._get(self._session_key(session_id))
+        if value is None:
+            if self.default_factory is None:
+                raise KeyError(session_id)
+            record = self.default_factory()
+            self[session_id] = record
+            return record
+        return orjson.loads(value)
+
+    def __setitem__(self, session_id: str, record: Dict[str, Any]) -> None:
+        """Persist a session record and keep its documents alive with it."""
+        document_keys = [
+            self._document_key(session_id, doc["id"]) for doc in record.get("documents", [])
+        ]
+        self._set(
+            self._session_key(session_id),
+            orjson.dumps(record).decode("utf-8"),
+            touch=document_keys,
+        )
+
+    def __delitem__(self, session_id: str) -> None:
+        """Delete a session record and all of its document contents."""
+        value = self._get(self._session_key(session_id))
+        if value is None:
+            return
+        record = orjson.loads(value)
+        document_keys = [
+            self._document_key(session_id, doc["id"]) for doc in record.get("documents", [])
+        ]
+        self._delete(self._session_key(session_id), *document_keys)
+
+    # Document contents
+
+    def set_document_content(self, session_id: str, doc_id: str, content: str) -> None:
+        """Store the extracted text of an uploaded document."""
+        self._set(self._document_key(session_id, doc_id), content)
+
+    def get_document_contents(self, session_id: str, doc_ids: List[str]) -> List[str]:
+        """
+        Fetch extracted text for several documents.
+
+        Args:
+            session_id: Owning session.
+            doc_ids: Document IDs to fetch.
+
+        Returns:
+            Contents in the same order as doc_ids ("" for missing documents).
+        """
+        values = self._mget([self._document_key(session_id, doc_id) for doc_id in doc_ids])
+        missing = [doc_id for doc_id, value in zip(doc_ids, values) if value is None]
+        if missing:
+            # Contents can be evicted apart from the record that lists them
+            get_logger().warning(
+                "Document contents missing from session store",
+                session_id=session_id,
+                doc_ids=missing,
+            )
+        return [value if value is not None else "" for value in values]
+
+    def delete_document_content(self, session_id: str, doc_id: str) -> None:
+        """Remove the stored text of a document."""
+        self._delete(self._document_key(session_id, doc_id))
+
+    # Extraction cache
+
+    def get_extracted_text(self, digest: str) -> Optional[str]:
+        """Look up previously extracted text for a file's SHA-256 digest."""
+        return self._get(f"extract:{digest}")
+
+    def set_extracted_text(self, digest: str, text: str) -> None:
+        """Remember the extracted text for a file's SHA-256 digest."""
+        self._set(f"extract:{digest}", text)
+
+    # Async access for request handlers
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a store operation in a worker thread when it goes over the network."""
+        if self._redis is None:
+            # In-process operations are dictionary lookups; a thread hop costs more
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    async def acontains(self, session_id: str) -> bool:
+        """Async counterpart of ``session_id in store``."""
+        return await self._run(self.__contains__, session_id)
+
+    async def aget(self, session_id: str) -> Dict[str, Any]:
+        """Async counterpart of ``store[session_id]``."""
+        return await self._run(self.__getitem__, session_id)
+
+    async def aset(self, session_id: str, record: Dict[str, Any]) -> None:
+        """Async counterpart of ``store[session_id] = record``."""
+        await self._run(self.__setitem__, session_id, record)
+
+    async def adelete(self, session_id: str) -> None:
+        """Async counterpart of ``del store[session_id]``."""
+        await self._run(self.__delitem__, session_id)
+
+    async def aset_document_content(self, session_id: str, doc_id: str, content: str) -> None:
+        """Async counterpart of set_document_content()."""
+        await self._run(self.set_document_content, session_id, doc_id, content)
+
+    async def aget_document_contents(self, session_id: str, doc_ids: List[str]) -> List[str]:
+        """Async counterpart of get_document_contents()."""
+        return await self._run(self.get_document_contents, session_id, doc_ids)
+
+    async def adelete_document_content(self, session_id: str, doc_id: str) -> None:
+        """Async counterpart of delete_document_content()."""
+        await self._run(self.delete_document_content, session_id, doc_id)
+
+    async def aget_extracted_text(self, digest: str) -> Optional[str]:
+        """Async counterpart of get_extracted_text()."""
+        return await self._run(self.get_extracted_text, digest)
+
+    async def aset_extracted_text(self, digest: str, text: str) -> None:
+        """Async counterpart of set_extracted_text()."""
+        await self._run(self.set_extracted_text, digest, text)
+
+
+def create_session_store(
+    default_factory: Optional[Callable[[], Dict[str, Any]]] = None,
+) -> SessionStore:
+    """
+    Create the session store configured by REDIS_URL and SESSION_TTL.
+
+    Args:
+        default_factory: Builds the record for sessions read before creation.
+
+    Returns:
+        SessionStore backed by Redis if configured, otherwise in-process.
+    """
+    return SessionStore(
+        redis_url=config.session.redis_url,
+        ttl=config.session.ttl,
+        default_factory=default_factory,
+        max_entries=config.session.max_entries,
+    )
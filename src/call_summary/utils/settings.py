@@ -5,12 +5,23 @@ This module handles loading and accessing environment variables
 from .env files and system environment.
 """
 
+import functools
 import os
+import threading
 from dataclasses import dataclass
 from typing import List, Optional
 
 from dotenv import load_dotenv
 
+# Settings are read straight from os.environ (after load_dotenv has filled it)
+_getenv = os.environ.get
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dotenv_once() -> bool:
+    """Load the .env file into os.environ on the first call only."""
+    return load_dotenv()
+
 
 @dataclass
 class OAuthConfig:
@@ -41,6 +52,16 @@ class ConversationConfig:
     max_history_length: int
 
 
+@dataclass
+class SessionConfig:
+    """Web session storage configuration."""
+
+    redis_url: str
+    ttl: int
+    max_entries: int
+    upload_max_bytes: int
+
+
 @dataclass
 class LLMModelConfig:
     """Configuration for a single LLM model tier."""
@@ -89,9 +110,11 @@ class Config:  # pylint: disable=too-many-instance-attributes
         log_level: Logging level (DEBUG/INFO/WARNING/ERROR/CRITICAL). Default: INFO
         auth_method: Authentication method ("oauth" or "api_key"). Default: "api_key"
         api_key: Direct API key for LLM. Default: ""
+        whisper_warmup: Load Whisper at server startup instead of on first use. Default: False
         oauth: OAuth configuration settings
         ssl: SSL configuration settings
         conversation: Conversation processing settings
+        session: Web session storage settings
 
     Environment Variables:
         LOG_LEVEL: Set logging verbosity
@@ -108,10 +131,35 @@ class Config:  # pylint: disable=too-many-instance-attributes
         OAUTH_GRANT_TYPE: OAuth grant type (typically client_credentials)
         OAUTH_MAX_RETRIES: Maximum retry attempts for token generation
         OAUTH_RETRY_DELAY: Initial retry delay in seconds
+        REDIS_URL: Redis URL for shared session storage (in-process store if unset)
+        SESSION_TTL: Seconds an idle session is kept before expiring
+        SESSION_MAX_ENTRIES: Entry cap for the in-process store (least recently used evicted)
+        UPLOAD_MAX_BYTES: Disk budget for uploaded files before the oldest are evicted
+        WHISPER_WARMUP: "true"/"false" to load Whisper at startup (voice deployments)
     """
 
     _instance = None
     _loaded = False
+    _lock = threading.Lock()
+
+    # Sub-configurations built lazily by cached_property
+    _SUB_CONFIGS = ("conversation", "session", "ssl", "oauth", "llm")
+
+    # Flat attribute names kept for backward compatibility, mapped to
+    # (sub-config, field); resolved on access by __getattr__
+    _LEGACY_ATTRIBUTES = {
+        "oauth_endpoint": ("oauth", "endpoint"),
+        "oauth_client_id": ("oauth", "client_id"),
+        "oauth_client_secret": ("oauth", "client_secret"),
+        "oauth_grant_type": ("oauth", "grant_type"),
+        "oauth_max_retries": ("oauth", "max_retries"),
+        "oauth_retry_delay": ("oauth", "retry_delay"),
+        "ssl_verify": ("ssl", "verify"),
+        "ssl_cert_path": ("ssl", "cert_path"),
+        "include_system_messages": ("conversation", "include_system_messages"),
+        "allowed_roles": ("conversation", "allowed_roles"),
+        "max_history_length": ("conversation", "max_history_length"),
+    }
 
     def __new__(cls):
         """
@@ -121,126 +169,145 @@ class Config:  # pylint: disable=too-many-instance-attributes
             The single Config instance.
         """
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
 
     def __init__(self):
         """Initialize configuration by loading environment variables."""
         if not Config._loaded:
-            self.load_config()
-            Config._loaded = True
+            with Config._lock:
+                if not Config._loaded:
+                    self.load_config()
+                    Config._loaded = True
 
     def load_config(self) -> None:
         """
         Load configuration from .env file and environment variables.
 
-        Loads .env file if present and sets configuration attributes
-        from environment variables with appropriate defaults.
+        Loads .env file if present and sets the top-level settings. The
+        sub-configurations (conversation, session, ssl, oauth, llm) are
+        built from the environment on first access; calling this again
+        discards the cached ones so they are rebuilt from the current
+        environment.
         """
-        # Load .env file if it exists
-        load_dotenv()
+        # Load .env file if it exists (parsed once per process, also on reload)
+        _load_dotenv_once()
+
+        # Drop cached sub-configurations so a reload picks up new values
+        for name in self._SUB_CONFIGS:
+            self.__dict__.pop(name, None)
 
         # Top-level Configuration
-        self.log_level = os.getenv("LOG_LEVEL", "INFO")
-        self.auth_method = os.getenv("AUTH_METHOD", "api_key").lower()
-        self.api_key = os.getenv("API_KEY", "")
-        self.environment = os.getenv("ENVIRONMENT", "local")  # local, dev, sai, or prod
-
-        # Conversation Configuration
-        self.conversation = ConversationConfig(
-            include_system_messages=os.getenv("INCLUDE_SYSTEM_MESSAGES", "false").lower() == "true",
+        self.log_level = _getenv("LOG_LEVEL", "INFO")
+        self.auth_method = _getenv("AUTH_METHOD", "api_key").lower()
+        self.api_key = _getenv("API_KEY", "")
+        self.environment = _getenv("ENVIRONMENT", "local")  # local, dev, sai, or prod
+        self.whisper_warmup = _getenv("WHISPER_WARMUP", "false").lower() == "true"
+
+        # PostgreSQL Configuration
+        self.postgres_host = _getenv("POSTGRES_HOST", "localhost")
+        self.postgres_port = _getenv("POSTGRES_PORT", "5432")
+        self.postgres_database = _getenv("POSTGRES_DATABASE", "")
+        self.postgres_user = _getenv("POSTGRES_USER", "")
+        self.postgres_password = _getenv("POSTGRES_PASSWORD", "")
+
+    @functools.cached_property
+    def conversation(self) -> ConversationConfig:
+        """Conversation processing configuration."""
+        return ConversationConfig(
+            include_system_messages=_getenv("INCLUDE_SYSTEM_MESSAGES", "false").lower() == "true",
             allowed_roles=[
-                role.strip() for role in os.getenv("ALLOWED_ROLES", "user,assistant").split(",")
+                role.strip() for role in _getenv("ALLOWED_ROLES", "user,assistant").split(",")
             ],
-            max_history_length=int(os.getenv("MAX_HISTORY_LENGTH", "10")),
+            max_history_length=int(_getenv("MAX_HISTORY_LENGTH", "10")),
         )
 
-        # SSL Configuration
-        self.ssl = SSLConfig(
-            verify=os.getenv("SSL_VERIFY", "false").lower() == "true",
-            cert_path=os.getenv("SSL_CERT_PATH", ""),
+    @functools.cached_property
+    def session(self) -> SessionConfig:
+        """Session storage configuration."""
+        return SessionConfig(
+            redis_url=_getenv("REDIS_URL", ""),
+            ttl=int(_getenv("SESSION_TTL", "3600")),
+            max_entries=int(_getenv("SESSION_MAX_ENTRIES", "4096")),
+            upload_max_bytes=int(_getenv("UPLOAD_MAX_BYTES", str(1024 * 1024 * 1024))),
         )
 
-        # OAuth Configuration
-        self.oauth = OAuthConfig(
-            endpoint=os.getenv("OAUTH_ENDPOINT", ""),
-            client_id=os.getenv("OAUTH_CLIENT_ID", ""),
-            client_secret=os.getenv("OAUTH_CLIENT_SECRET", ""),
-            grant_type=os.getenv("OAUTH_GRANT_TYPE", "client_credentials"),
-            max_retries=int(os.getenv("OAUTH_MAX_RETRIES", "3")),
-            retry_delay=int(os.getenv("OAUTH_RETRY_DELAY", "1")),
+    @functools.cached_property
+    def ssl(self) -> SSLConfig:
+        """SSL configuration."""
+        return SSLConfig(
+            verify=_getenv("SSL_VERIFY", "false").lower() == "true",
+            cert_path=_getenv("SSL_CERT_PATH", ""),
         )
 
-        # PostgreSQL Configuration
-        self.postgres_host = os.getenv("POSTGRES_HOST", "localhost")
-        self.postgres_port = os.getenv("POSTGRES_PORT", "5432")
-        self.postgres_database = os.getenv("POSTGRES_DATABASE", "")
-        self.postgres_user = os.getenv("POSTGRES_USER", "")
-        self.postgres_password = os.getenv("POSTGRES_PASSWORD", "")
-
-        # LLM Configuration
-        self.llm = LLMConfig(
-            base_url=os.getenv("LLM_BASE_URL", "https://api.openai.com/v1"),
+    @functools.cached_property
+    def oauth(self) -> OAuthConfig:
+        """OAuth configuration."""
+        return OAuthConfig(
+            endpoint=_getenv("OAUTH_ENDPOINT", ""),
+            client_id=_getenv("OAUTH_CLIENT_ID", ""),
+            client_secret=_getenv("OAUTH_CLIENT_SECRET", ""),
+            grant_type=_getenv("OAUTH_GRANT_TYPE", "client_credentials"),
+            max_retries=int(_getenv("OAUTH_MAX_RETRIES", "3")),
+            retry_delay=int(_getenv("OAUTH_RETRY_DELAY", "1")),
+        )
+
+    @functools.cached_property
+    def llm(self) -> LLMConfig:
+        """LLM configuration with model tiers."""
+        return LLMConfig(
+            base_url=_getenv("LLM_BASE_URL", "https://api.openai.com/v1"),
             small=LLMModelConfig(
-                model=os.getenv("LLM_MODEL_SMALL", "gpt-4.1-nano-2025-04-14"),
-                temperature=float(os.getenv("LLM_TEMPERATURE_SMALL", "0.3")),
-                max_tokens=int(os.getenv("LLM_MAX_TOKENS_SMALL", "1000")),
-                timeout=int(os.getenv("LLM_TIMEOUT_SMALL", "30")),
-                max_retries=int(os.getenv("LLM_MAX_RETRIES_SMALL", "3")),
-                cost_per_1k_input=float(os.getenv("LLM_COST_INPUT_SMALL", "0.0001")),
-                cost_per_1k_output=float(os.getenv("LLM_COST_OUTPUT_SMALL", "0.0002")),
+                model=_getenv("LLM_MODEL_SMALL", "gpt-4.1-nano-2025-04-14"),
+                temperature=float(_getenv("LLM_TEMPERATURE_SMALL", "0.3")),
+                max_tokens=int(_getenv("LLM_MAX_TOKENS_SMALL", "1000")),
+                timeout=int(_getenv("LLM_TIMEOUT_SMALL", "30")),
+                max_retries=int(_getenv("LLM_MAX_RETRIES_SMALL", "3")),
+                cost_per_1k_input=float(_getenv("LLM_COST_INPUT_SMALL", "0.0001")),
+                cost_per_1k_output=float(_getenv("LLM_COST_OUTPUT_SMALL", "0.0002")),
             ),
             medium=LLMModelConfig(
-                model=os.getenv("LLM_MODEL_MEDIUM", "gpt-4.1-mini-2025-04-14"),
-                temperature=float(os.getenv("LLM_TEMPERATURE_MEDIUM", "0.5")),
-                max_tokens=int(os.getenv("LLM_MAX_TOKENS_MEDIUM", "2000")),
-                timeout=int(os.getenv("LLM_TIMEOUT_MEDIUM", "60")),
-                max_retries=int(os.getenv("LLM_MAX_RETRIES_MEDIUM", "3")),
-                cost_per_1k_input=float(os.getenv("LLM_COST_INPUT_MEDIUM", "0.0003")),
-                cost_per_1k_output=float(os.getenv("LLM_COST_OUTPUT_MEDIUM", "0.0006")),
+                model=_getenv("LLM_MODEL_MEDIUM", "gpt-4.1-mini-2025-04-14"),
+                temperature=float(_getenv("LLM_TEMPERATURE_MEDIUM", "0.5")),
+                max_tokens=int(_getenv("LLM_MAX_TOKENS_MEDIUM", "2000")),
+                timeout=int(_getenv("LLM_TIMEOUT_MEDIUM", "60")),
+                max_retries=int(_getenv("LLM_MAX_RETRIES_MEDIUM", "3")),
+                cost_per_1k_input=float(_getenv("LLM_COST_INPUT_MEDIUM", "0.0003")),
+                cost_per_1k_output=float(_getenv("LLM_COST_OUTPUT_MEDIUM", "0.0006")),
             ),
             large=LLMModelConfig(
-                model=os.getenv("LLM_MODEL_LARGE", "gpt-4.1-2025-04-14"),
-                temperature=float(os.getenv("LLM_TEMPERATURE_LARGE", "0.7")),
-                max_tokens=int(os.getenv("LLM_MAX_TOKENS_LARGE", "4000")),
-                timeout=int(os.getenv("LLM_TIMEOUT_LARGE", "120")),
-                max_retries=int(os.getenv("LLM_MAX_RETRIES_LARGE", "3")),
-                cost_per_1k_input=float(os.getenv("LLM_COST_INPUT_LARGE", "0.0010")),
-                cost_per_1k_output=float(os.getenv("LLM_COST_OUTPUT_LARGE", "0.0020")),
+                model=_getenv("LLM_MODEL_LARGE", "gpt-4.1-2025-04-14"),
+                temperature=float(_getenv("LLM_TEMPERATURE_LARGE", "0.7")),
+                max_tokens=int(_getenv("LLM_MAX_TOKENS_LARGE", "4000")),
+                timeout=int(_getenv("LLM_TIMEOUT_LARGE", "120")),
+                max_retries=int(_getenv("LLM_MAX_RETRIES_LARGE", "3")),
+                cost_per_1k_input=float(_getenv("LLM_COST_INPUT_LARGE", "0.0010")),
+                cost_per_1k_output=float(_getenv("LLM_COST_OUTPUT_LARGE", "0.0020")),
             ),
             embedding=LLMEmbeddingConfig(
-                model=os.getenv("LLM_EMBEDDING_MODEL", "text-embedding-3-large"),
-                dimensions=int(os.getenv("LLM_EMBEDDING_DIMENSIONS", "3072")),
-                timeout=int(os.getenv("LLM_EMBEDDING_TIMEOUT", "30")),
-                max_retries=int(os.getenv("LLM_EMBEDDING_MAX_RETRIES", "3")),
-                cost_per_1k_input=float(os.getenv("LLM_EMBEDDING_COST_INPUT", "0.00002")),
+                model=_getenv("LLM_EMBEDDING_MODEL", "text-embedding-3-large"),
+                dimensions=int(_getenv("LLM_EMBEDDING_DIMENSIONS", "3072")),
+                timeout=int(_getenv("LLM_EMBEDDING_TIMEOUT", "30")),
+                max_retries=int(_getenv("LLM_EMBEDDING_MAX_RETRIES", "3")),
+                cost_per_1k_input=float(_getenv("LLM_EMBEDDING_COST_INPUT", "0.00002")),
             ),
         )
 
-        # Create legacy attributes for backward compatibility
-        self._create_legacy_attributes()
-
-    def _create_legacy_attributes(self) -> None:
-        """Create legacy attributes for backward compatibility."""
-        # pylint: disable=attribute-defined-outside-init
-        # Dynamic attributes needed for backward compatibility with existing code.
-        # OAuth attributes
-        self.oauth_endpoint = self.oauth.endpoint
-        self.oauth_client_id = self.oauth.client_id
-        self.oauth_client_secret = self.oauth.client_secret
-        self.oauth_grant_type = self.oauth.grant_type
-        self.oauth_max_retries = self.oauth.max_retries
-        self.oauth_retry_delay = self.oauth.retry_delay
-
-        # SSL attributes
-        self.ssl_verify = self.ssl.verify
-        self.ssl_cert_path = self.ssl.cert_path
-
-        # Conversation attributes
-        self.include_system_messages = self.conversation.include_system_messages
-        self.allowed_roles = self.conversation.allowed_roles
-        self.max_history_length = self.conversation.max_history_length
-        # pylint: enable=attribute-defined-outside-init  # Re-enable after dynamic attributes
+    def __getattr__(self, name: str):
+        """
+        Resolve legacy flat attributes (e.g. oauth_endpoint) from the sub-configs.
+
+        Only called when normal lookup fails, so assigned attributes win.
+        """
+        try:
+            section, field = Config._LEGACY_ATTRIBUTES[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            ) from None
+        return getattr(getattr(self, section), field)
 
     def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """
@@ -4,6 +4,7 @@ SSL configuration module.
 This module handles SSL certificate loading based on environment configuration.
 """
 
+import functools
 import os
 from typing import Dict, Optional, Union
 
@@ -18,6 +19,10 @@ def setup_ssl() -> Dict[str, Union[bool, Optional[str]]]:
     Checks SSL_VERIFY and SSL_CERT_PATH environment variables and returns
     a consistent output schema for both verify and non-verify scenarios.
 
+    The result is computed once per (verify, cert_path) setting, so the
+    certificate path is expanded and checked on disk only once. The
+    returned dict is shared between callers and must not be modified.
+
     Returns:
         Dictionary with SSL configuration:
         - "success": bool - Whether SSL setup succeeded
@@ -34,11 +39,19 @@ def setup_ssl() -> Dict[str, Union[bool, Optional[str]]]:
         #          "status": "failed", "error": "Certificate not found",
         #          "decision_details": "SSL setup failed: Certificate not found"}
     """
+    return _setup_ssl_cached(config.ssl_verify, config.ssl_cert_path)
+
+
+@functools.lru_cache(maxsize=1)
+def _setup_ssl_cached(
+    ssl_verify: bool, cert_path: Optional[str]
+) -> Dict[str, Union[bool, Optional[str]]]:
+    """Build the setup_ssl() result for one verify/cert_path setting."""
     logger = get_logger()
 
     try:
         # Check if SSL verification is enabled
-        if not config.ssl_verify:
+        if not ssl_verify:
             logger.debug("SSL verification disabled")
             return {
                 "success": True,
@@ -50,8 +63,6 @@ def setup_ssl() -> Dict[str, Union[bool, Optional[str]]]:
             }
 
         # SSL verification is enabled
-        cert_path = config.ssl_cert_path
-
         if cert_path:
             # Expand user path if needed
             cert_path = os.path.expanduser(cert_path)
@@ -0,0 +1,100 @@
+"""
+Regression checks for the streaming DOCX extractor.
+
+extract_text_from_docx() reads word/document.xml with lxml directly and
+must produce the same text as the python-docx fallback, including tabs,
+soft line breaks, hyperlinks and tables, without picking up text boxes.
+"""
+
+import io
+import unittest
+from unittest import mock
+
+import docx
+from docx.enum.text import WD_BREAK
+from docx.oxml import parse_xml
+
+import app
+
+W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+MC_NS = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+WPS_NS = 'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+V_NS = 'xmlns:v="urn:schemas-microsoft-com:vml"'
+
+HYPERLINK_XML = f'<w:hyperlink {W_NS}><w:r><w:t>link text</w:t></w:r></w:hyperlink>'
+
+# A run holding a text box in both the DrawingML choice and the VML fallback
+TEXT_BOX_XML = f'''
+<w:r {W_NS} {MC_NS} {WPS_NS} {V_NS}>
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps">
+      <w:drawing><wps:txbx><w:txbxContent>
+        <w:p><w:r><w:t>text box</w:t></w:r></w:p>
+      </w:txbxContent></wps:txbx></w:drawing>
+    </mc:Choice>
+    <mc:Fallback>
+      <w:pict><v:textbox><w:txbxContent>
+        <w:p><w:r><w:t>text box</w:t></w:r></w:p>
+      </w:txbxContent></v:textbox></w:pict>
+    </mc:Fallback>
+  </mc:AlternateContent>
+</w:r>
+'''
+
+
+def build_fixture():
+    """Build a document with tabs, breaks, a hyperlink, a text box and a table."""
+    document = docx.Document()
+    document.add_paragraph('Name\tValue')
+    document.add_paragraph('Line1\nLine2')
+
+    paragraph = document.add_paragraph('Before page break')
+    paragraph.add_run().add_break(WD_BREAK.PAGE)
+    paragraph.add_run('after')
+
+    paragraph = document.add_paragraph('See ')
+    paragraph._p.append(parse_xml(HYPERLINK_XML))
+    paragraph._p.append(parse_xml(TEXT_BOX_XML))
+    paragraph.add_run(' here')
+
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = 'Header\tA'
+    table.cell(0, 1).text = 'Header B'
+    table.cell(1, 0).text = 'first\nsecond'
+    table.cell(1, 1).add_paragraph('extra paragraph')
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class DocxExtractionTest(unittest.TestCase):
+    """Compare the streaming extractor with the python-docx fallback."""
+
+    def setUp(self):
+        self.fixture = build_fixture()
+
+    def test_matches_python_docx(self):
+        expected = app.extract_text_from_docx_python_docx(io.BytesIO(self.fixture))
+
+        # Fail loudly rather than passing by falling back to python-docx
+        with mock.patch.object(
+            app, 'extract_text_from_docx_python_docx', side_effect=AssertionError('fell back')
+        ):
+            actual = app.extract_text_from_docx(io.BytesIO(self.fixture))
+
+        self.assertEqual(actual, expected)
+
+    def test_keeps_tabs_and_breaks(self):
+        text = app.extract_text_from_docx(io.BytesIO(self.fixture))
+
+        self.assertIn('Name\tValue', text)
+        self.assertIn('Line1\nLine2', text)
+        self.assertIn('Before page breakafter', text)
+        self.assertIn('See link text here', text)
+        self.assertIn('Header\tA | Header B', text)
+        self.assertNotIn('text box', text)
+
+
+if __name__ == '__main__':
+    unittest.main()